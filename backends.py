@@ -0,0 +1,444 @@
+import ctypes
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+import time
+from collections import namedtuple
+
+try:
+    import pywifi
+    from pywifi import const
+except ImportError:  # pywifi only drives real radios; fake interfaces work without it
+    pywifi = None
+    const = None
+
+STATUS_DISCONNECTED = 'disconnected'
+STATUS_SCANNING = 'scanning'
+STATUS_INACTIVE = 'inactive'
+STATUS_CONNECTING = 'connecting'
+STATUS_CONNECTED = 'connected'
+
+NMCLI_CONNECT_WAIT = 15  # seconds nmcli may wait for activation while it holds the password
+
+logger = logging.getLogger(__name__)
+
+# A single scan result. Backends may return any object with these attributes
+# (pywifi returns its own Profile objects). signal is in dBm.
+AccessPoint = namedtuple('AccessPoint', ['ssid', 'bssid', 'signal', 'freq', 'akm'])
+
+
+def percent_to_dbm(percent):
+    """Converts a 0-100 signal quality to dBm using the usual Windows/NetworkManager mapping."""
+    return percent // 2 - 100
+
+
+def dbm_to_percent(dbm):
+    """Converts dBm to a 0-100 signal quality (inverse of percent_to_dbm, clamped)."""
+    return int(max(0, min(100, 2 * (dbm + 100))))
+
+
+class Backend:
+    """
+    Platform Wi-Fi operations used by WiFiSwitcher, for a single wireless interface.
+    connect() and connect_enterprise() only start an association; callers poll status().
+    """
+    name = 'base'
+    clock = time  # anything with monotonic() and sleep(); simulations substitute a virtual clock
+
+    def interface_name(self):
+        raise NotImplementedError
+
+    def scan(self):
+        """Starts a scan. Results show up in scan_results() once the driver finishes."""
+        raise NotImplementedError
+
+    def scan_results(self):
+        """Returns the latest (possibly cached) scan results."""
+        raise NotImplementedError
+
+    def status(self):
+        """Returns one of the STATUS_* constants."""
+        raise NotImplementedError
+
+    def current_connection(self):
+        """Returns (ssid, signal_percent), or (None, None) when not associated."""
+        raise NotImplementedError
+
+    def connect(self, ssid, password, bssid=None):
+        """
+        Starts connecting to a WPA2-Personal network, pinned to bssid where the platform allows.
+        Returns False if the request was rejected.
+        """
+        raise NotImplementedError
+
+    def connect_enterprise(self, ssid, username, password, bssid=None):
+        """Starts connecting through a pre-existing OS profile. Returns False if the request was rejected."""
+        raise NotImplementedError
+
+    def installed_profiles(self):
+        """Returns the SSIDs that already have an OS network profile."""
+        raise NotImplementedError
+
+    def activate_profile(self, ssid, bssid=None):
+        """Starts connecting with an already installed profile. Returns False if the request was rejected."""
+        raise NotImplementedError
+
+    def disconnect(self):
+        raise NotImplementedError
+
+    def watch(self, callback):
+        """
+        Calls callback() from a background thread whenever the OS reports a connection change.
+        Returns a function that stops watching, or None if the backend has no change events.
+        """
+        return None
+
+
+class _Dot11Ssid(ctypes.Structure):
+    _fields_ = [('uSSIDLength', ctypes.c_ulong), ('ucSSID', ctypes.c_ubyte * 32)]
+
+
+class _WlanAssociationAttributes(ctypes.Structure):
+    _fields_ = [('dot11Ssid', _Dot11Ssid),
+                ('dot11BssType', ctypes.c_uint),
+                ('dot11Bssid', ctypes.c_ubyte * 6),
+                ('dot11PhyType', ctypes.c_uint),
+                ('uDot11PhyIndex', ctypes.c_ulong),
+                ('wlanSignalQuality', ctypes.c_ulong),
+                ('ulRxRate', ctypes.c_ulong),
+                ('ulTxRate', ctypes.c_ulong)]
+
+
+class _WlanSecurityAttributes(ctypes.Structure):
+    _fields_ = [('bSecurityEnabled', ctypes.c_int),
+                ('bOneXEnabled', ctypes.c_int),
+                ('dot11AuthAlgorithm', ctypes.c_uint),
+                ('dot11CipherAlgorithm', ctypes.c_uint)]
+
+
+class _WlanConnectionAttributes(ctypes.Structure):
+    _fields_ = [('isState', ctypes.c_uint),
+                ('wlanConnectionMode', ctypes.c_uint),
+                ('strProfileName', ctypes.c_wchar * 256),
+                ('wlanAssociationAttributes', _WlanAssociationAttributes),
+                ('wlanSecurityAttributes', _WlanSecurityAttributes)]
+
+
+class _WlanConnectionQuery:
+    """Reads the current association straight from wlanapi.dll, so status checks need no netsh fork."""
+    _OPCODE_CURRENT_CONNECTION = 7
+    _STATE_CONNECTED = 1
+
+    def __init__(self, interface_guid):
+        self._wlanapi = ctypes.windll.wlanapi
+        self._guid = interface_guid
+        self._handle = ctypes.c_void_p()
+        negotiated_version = ctypes.c_ulong()
+        error = self._wlanapi.WlanOpenHandle(2, None, ctypes.byref(negotiated_version), ctypes.byref(self._handle))
+        if error:
+            raise OSError(error, "WlanOpenHandle failed")
+
+    def query(self):
+        data = ctypes.c_void_p()
+        data_size = ctypes.c_ulong()
+        error = self._wlanapi.WlanQueryInterface(self._handle, ctypes.byref(self._guid),
+                                                 self._OPCODE_CURRENT_CONNECTION, None,
+                                                 ctypes.byref(data_size), ctypes.byref(data), None)
+        if error:  # ERROR_INVALID_STATE while the interface is not associated
+            return None, None
+        try:
+            attributes = ctypes.cast(data, ctypes.POINTER(_WlanConnectionAttributes)).contents
+            if attributes.isState != self._STATE_CONNECTED:
+                return None, None
+            association = attributes.wlanAssociationAttributes
+            raw_ssid = bytes(association.dot11Ssid.ucSSID[:association.dot11Ssid.uSSIDLength])
+            return raw_ssid.decode('utf-8', errors='ignore'), int(association.wlanSignalQuality)
+        finally:
+            self._wlanapi.WlanFreeMemory(data)
+
+
+class PyWiFiBackend(Backend):
+    """Windows backend: pywifi for scanning and association, netsh for status and enterprise profiles."""
+    name = 'pywifi'
+
+    def __init__(self, iface=None, const_module=None, profile_class=None):
+        """
+        iface, const_module and profile_class default to pywifi's; passing all three lets
+        a stand-in interface (e.g. simulation.FakeInterface) run where pywifi is not installed.
+        """
+        if pywifi is None and (iface is None or const_module is None or profile_class is None):
+            raise RuntimeError("pywifi is not installed; pass iface, const_module and profile_class explicitly.")
+        self.const = const_module or const
+        self.profile_class = profile_class or pywifi.Profile
+        if iface is None:
+            iface = pywifi.PyWiFi().interfaces()[0]
+        self.iface = iface
+        self._native_query = None
+        raw_interface = getattr(iface, '_raw_obj', None)
+        if os.name == 'nt' and isinstance(raw_interface, dict) and 'guid' in raw_interface:
+            try:
+                self._native_query = _WlanConnectionQuery(raw_interface['guid'])
+            except (OSError, AttributeError) as e:
+                logger.warning(f"⚠️ Native WLAN status unavailable, falling back to netsh: {e}")
+        self._status_map = {
+            self.const.IFACE_DISCONNECTED: STATUS_DISCONNECTED,
+            self.const.IFACE_SCANNING: STATUS_SCANNING,
+            self.const.IFACE_INACTIVE: STATUS_INACTIVE,
+            self.const.IFACE_CONNECTING: STATUS_CONNECTING,
+            self.const.IFACE_CONNECTED: STATUS_CONNECTED,
+        }
+
+    def interface_name(self):
+        return self.iface.name()
+
+    def scan(self):
+        self.iface.scan()
+
+    def scan_results(self):
+        return self.iface.scan_results()
+
+    def status(self):
+        return self._status_map.get(self.iface.status(), STATUS_DISCONNECTED)
+
+    def current_connection(self):
+        if self._native_query is not None:
+            return self._native_query.query()
+        try:
+            result = subprocess.check_output(['netsh', 'wlan', 'show', 'interfaces'], encoding='utf-8', errors='ignore')
+            current_ssid = None
+            signal_percent = None
+            ours = True  # netsh lists every adapter; only read the block for this one
+            for line in result.split('\n'):
+                if line.strip().startswith("Name") and ":" in line:
+                    ours = line.split(":", 1)[1].strip() == self.interface_name()
+                if not ours:
+                    continue
+                if "SSID" in line and "BSSID" not in line:
+                    current_ssid = line.split(":")[1].strip()
+                if "Signal" in line:
+                    signal_percent = int(line.split(":")[1].strip().replace('%', ''))
+            return current_ssid, signal_percent
+        except Exception:
+            return None, None
+
+    # pywifi (and netsh) cannot pin a BSSID on Windows; the driver picks the AP, so bssid is ignored.
+    def connect(self, ssid, password, bssid=None):
+        profile = self.profile_class()
+        profile.ssid = ssid
+        profile.auth = self.const.AUTH_ALG_OPEN
+        profile.akm.append(self.const.AKM_TYPE_WPA2PSK)
+        profile.cipher = self.const.CIPHER_TYPE_CCMP
+        profile.key = password
+        tmp_profile = self.iface.add_network_profile(profile)
+        self.iface.connect(tmp_profile)
+        return True
+
+    def connect_enterprise(self, ssid, username, password, bssid=None):
+        # An argv list, not a shell string, so quotes in an SSID or interface name stay literal.
+        command = ['netsh', 'wlan', 'connect', f'name={ssid}', f'interface={self.interface_name()}']
+        try:
+            subprocess.run(command, check=True, capture_output=True, text=True, errors='ignore')
+            return True
+        except subprocess.CalledProcessError as e:
+            logger.error(f"❌ Error executing netsh command for '{ssid}': {e.stderr}")
+            return False
+
+    def installed_profiles(self):
+        return {profile.ssid for profile in self.iface.network_profiles()}
+
+    def activate_profile(self, ssid, bssid=None):
+        # pywifi connects by profile name, which Windows sets to the SSID.
+        profile = self.profile_class()
+        profile.ssid = ssid
+        self.iface.connect(profile)
+        return True
+
+    def disconnect(self):
+        self.iface.disconnect()
+
+
+def _split_terse(line):
+    """Splits one line of `nmcli -t` output on unescaped colons."""
+    fields, current, escaped = [], [], False
+    for ch in line:
+        if escaped:
+            current.append(ch)
+            escaped = False
+        elif ch == '\\':
+            escaped = True
+        elif ch == ':':
+            fields.append(''.join(current))
+            current = []
+        else:
+            current.append(ch)
+    fields.append(''.join(current))
+    return fields
+
+
+def wifi_devices(nmcli='nmcli'):
+    """Returns the names of every Wi-Fi device NetworkManager knows about."""
+    output = subprocess.run([nmcli, '-t', '-f', 'DEVICE,TYPE', 'device'], capture_output=True, text=True,
+                            errors='ignore', check=True).stdout
+    return [fields[0] for fields in map(_split_terse, output.splitlines()) if len(fields) >= 2 and fields[1] == 'wifi']
+
+
+class NetworkManagerBackend(Backend):
+    """Linux backend driving NetworkManager through nmcli."""
+    name = 'nmcli'
+
+    def __init__(self, interface=None, nmcli='nmcli'):
+        self.nmcli = nmcli
+        self.interface = interface or self._first_wifi_device()
+
+    def _run(self, *args, check=True):
+        result = subprocess.run([self.nmcli, *args], capture_output=True, text=True, errors='ignore')
+        if check and result.returncode != 0:
+            raise subprocess.CalledProcessError(result.returncode, result.args, result.stdout, result.stderr)
+        return result.stdout
+
+    def _first_wifi_device(self):
+        devices = wifi_devices(self.nmcli)
+        if not devices:
+            raise RuntimeError("NetworkManager reports no Wi-Fi device.")
+        return devices[0]
+
+    def interface_name(self):
+        return self.interface
+
+    def scan(self):
+        # NetworkManager rate-limits rescans; a refused request still leaves usable cached results.
+        self._run('device', 'wifi', 'rescan', 'ifname', self.interface, check=False)
+
+    def scan_results(self):
+        output = self._run('-t', '-f', 'SSID,BSSID,SIGNAL,FREQ,SECURITY', 'device', 'wifi', 'list',
+                           'ifname', self.interface, '--rescan', 'no', check=False)
+        results = []
+        for line in output.splitlines():
+            fields = _split_terse(line)
+            if len(fields) < 5:
+                continue
+            ssid, bssid, signal, freq, security = fields[:5]
+            try:
+                signal_dbm = percent_to_dbm(int(signal))
+                freq_mhz = int(freq.split()[0])
+            except (ValueError, IndexError):
+                continue
+            results.append(AccessPoint(ssid, bssid.lower(), signal_dbm, freq_mhz, security.split()))
+        return results
+
+    def status(self):
+        for line in self._run('-t', '-f', 'DEVICE,STATE', 'device', check=False).splitlines():
+            fields = _split_terse(line)
+            if len(fields) >= 2 and fields[0] == self.interface:
+                state = fields[1]
+                if state.startswith('connected'):
+                    return STATUS_CONNECTED
+                if state.startswith('connecting'):
+                    return STATUS_CONNECTING
+                if state == 'unavailable':
+                    return STATUS_INACTIVE
+        return STATUS_DISCONNECTED
+
+    def current_connection(self):
+        try:
+            output = self._run('-t', '-f', 'ACTIVE,SSID,SIGNAL', 'device', 'wifi', 'list',
+                               'ifname', self.interface, '--rescan', 'no')
+        except (OSError, subprocess.CalledProcessError):
+            return None, None
+        for line in output.splitlines():
+            fields = _split_terse(line)
+            if len(fields) >= 3 and fields[0] == 'yes':
+                try:
+                    return fields[1], int(fields[2])
+                except ValueError:
+                    return fields[1], None
+        return None, None
+
+    def connect(self, ssid, password, bssid=None):
+        # The password reaches nmcli through a 0600 passwd-file, never argv, where `ps` would show it.
+        pin = ['ap', bssid] if bssid else []
+        try:
+            if ssid not in self.installed_profiles():
+                self._run('connection', 'add', 'type', 'wifi', 'con-name', ssid, 'ifname', '*', 'ssid', ssid,
+                          'wifi-sec.key-mgmt', 'wpa-psk')
+            fd, secrets_path = tempfile.mkstemp(prefix='wifi-switcher-')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    f.write(f"802-11-wireless-security.psk:{password or ''}\n")
+                # nmcli answers the secrets request itself, so it has to stay up until activation.
+                self._run('--wait', str(NMCLI_CONNECT_WAIT), 'connection', 'up', 'id', ssid,
+                          'ifname', self.interface, *pin, 'passwd-file', secrets_path)
+            finally:
+                os.remove(secrets_path)
+            return True
+        except subprocess.CalledProcessError as e:
+            logger.error(f"❌ nmcli could not connect to '{ssid}': {e.stderr}")
+            return False
+
+    def connect_enterprise(self, ssid, username, password, bssid=None):
+        pin = ['ap', bssid] if bssid else []
+        try:
+            self._run('--wait', '0', 'connection', 'up', 'id', ssid, 'ifname', self.interface, *pin)
+            return True
+        except subprocess.CalledProcessError as e:
+            logger.error(f"❌ nmcli could not activate profile '{ssid}': {e.stderr}")
+            return False
+
+    def installed_profiles(self):
+        output = self._run('-t', '-f', 'NAME,TYPE', 'connection', 'show', check=False)
+        profiles = set()
+        for line in output.splitlines():
+            fields = _split_terse(line)
+            if len(fields) >= 2 and fields[1] == '802-11-wireless':
+                profiles.add(fields[0])
+        return profiles
+
+    def activate_profile(self, ssid, bssid=None):
+        return self.connect_enterprise(ssid, None, None, bssid)
+
+    def disconnect(self):
+        self._run('device', 'disconnect', self.interface, check=False)
+
+    def watch(self, callback):
+        # One persistent `nmcli monitor` process replaces periodic status forks.
+        try:
+            process = subprocess.Popen([self.nmcli, 'monitor'], stdout=subprocess.PIPE,
+                                       stderr=subprocess.DEVNULL, text=True, errors='ignore')
+        except OSError:
+            return None
+
+        def pump():
+            for line in process.stdout:
+                if line.startswith(self.interface) or 'connection' in line.lower():
+                    callback()
+
+        threading.Thread(target=pump, name='nmcli-monitor', daemon=True).start()
+        return process.terminate
+
+
+def create_backends(name='auto', interfaces=None):
+    """
+    Builds one backend per wireless adapter: every adapter the platform reports, or
+    only those named in interfaces. Simulated adapters share one environment and clock.
+    """
+    if name == 'auto':
+        name = 'pywifi' if os.name == 'nt' else 'nmcli'
+    if name == 'pywifi':
+        if pywifi is None:
+            raise RuntimeError("pywifi is not installed.")
+        ifaces = pywifi.PyWiFi().interfaces()
+        backends = [PyWiFiBackend(iface) for iface in ifaces if not interfaces or iface.name() in interfaces]
+    elif name == 'nmcli':
+        backends = [NetworkManagerBackend(device) for device in (interfaces or wifi_devices())]
+    elif name == 'simulated':
+        from simulation import RFEnvironment, SimClock, SimulatedBackend
+        environment, clock = RFEnvironment.static([]), SimClock()
+        backends = [SimulatedBackend(environment, clock=clock, interface=interface)
+                    for interface in (interfaces or ['sim0'])]
+    else:
+        raise ValueError(f"Unknown backend '{name}'.")
+    if not backends:
+        raise RuntimeError(f"No wireless adapters found for the '{name}' backend.")
+    return backends
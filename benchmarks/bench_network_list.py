@@ -0,0 +1,84 @@
+"""
+Measures main-thread time per refresh of the Available Networks list:
+the old destroy-and-rebuild approach vs. NetworkListView's incremental updates.
+Needs a display. Run from the repository root: python benchmarks/bench_network_list.py
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import customtkinter
+
+from network_list import NetworkListView
+
+
+def make_scan(rng, ssid_count, visible_fraction=0.9):
+    """A scan where most SSIDs persist between refreshes and signals jitter by a few dB."""
+    return {f"SSID-{i:03d}": {'signal': -40 - (i % 50) + rng.randint(-3, 3)}
+            for i in range(ssid_count) if rng.random() < visible_fraction}
+
+
+def rebuild(frame, networks, known):
+    """The pre-incremental rendering: destroy every row and build it again."""
+    for widget in frame.winfo_children():
+        widget.destroy()
+    for i, (ssid, details) in enumerate(networks.items()):
+        network_frame = customtkinter.CTkFrame(frame)
+        network_frame.grid(row=i, column=0, padx=5, pady=5, sticky="ew")
+        network_frame.grid_columnconfigure(0, weight=1)
+        label = customtkinter.CTkLabel(network_frame, text=f"{ssid} ({details['signal']} dBm)")
+        label.grid(row=0, column=0, padx=10, pady=5, sticky="w")
+        if ssid in known:
+            customtkinter.CTkButton(network_frame, text="Connect").grid(row=0, column=1, padx=10, pady=5)
+
+
+def incremental(view, networks, known):
+    ordered = sorted(networks.items(), key=lambda item: item[1]['signal'], reverse=True)
+    view.update([(ssid, f"{ssid} ({details['signal']} dBm)", ssid in known) for ssid, details in ordered])
+
+
+def measure(root, refresh, scans):
+    timings = []
+    for networks in scans:
+        start = time.perf_counter()
+        refresh(networks)
+        root.update_idletasks()  # include geometry management, which also runs on the main thread
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--ssids', type=int, default=150)
+    parser.add_argument('--refreshes', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    scans = [make_scan(rng, args.ssids) for _ in range(args.refreshes)]
+    known = {f"SSID-{i:03d}" for i in range(0, args.ssids, 10)}
+
+    root = customtkinter.CTk()
+    root.withdraw()
+    legacy_frame = customtkinter.CTkScrollableFrame(root)
+    legacy_frame.grid_columnconfigure(0, weight=1)
+    view_frame = customtkinter.CTkScrollableFrame(root)
+    view_frame.grid_columnconfigure(0, weight=1)
+    view = NetworkListView(view_frame, [("Connect", lambda ssid: None, 140)], button_padx=10)
+
+    legacy = measure(root, lambda networks: rebuild(legacy_frame, networks, known), scans)
+    diffed = measure(root, lambda networks: incremental(view, networks, known), scans)
+    root.destroy()
+
+    for name, timings in (("rebuild", legacy), ("incremental", diffed)):
+        steady = timings[1:] or timings  # the first incremental refresh builds every row
+        print(f"{name:12s} first {timings[0]:7.1f} ms   steady median {statistics.median(steady):7.1f} ms   "
+              f"max {max(steady):7.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
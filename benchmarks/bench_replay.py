@@ -0,0 +1,174 @@
+"""
+Replays a recorded scan trace through the scan -> decide -> connect cycle on a
+virtual clock and reports decision latency, CPU per cycle, switch count and the
+simulated time spent disconnected.
+
+Record a trace with:  python switch_service.py --record-trace trace.jsonl
+Replay it with:       python benchmarks/bench_replay.py trace.jsonl
+Without a trace, a synthetic one is recorded from the simulated environment used
+by bench_switching.py, so this runs on any machine without a radio.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backends import STATUS_CONNECTED
+from bench_switching import build_environment
+from credential_store import CredentialStore
+from metrics import LatencyHistogram
+from policy import SwitchPolicy
+from scan_trace import RecordingBackend, Trace
+from simulation import SimClock, SimulatedBackend
+from switch_service import SwitchService
+from wifi_logic import WiFiSwitcher
+
+SCAN_INTERVAL = 45
+DECISION_BUCKETS = (0.00001, 0.00002, 0.00005, 0.0001, 0.0002, 0.0005, 0.001, 0.002, 0.005)
+CPU_BUCKETS = (0.0001, 0.0002, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05)
+
+
+class DowntimeClock(SimClock):
+    """A virtual clock that also totals the simulated time that passes while no adapter is connected."""
+
+    def __init__(self):
+        super().__init__()
+        self.backends = []
+        self.disconnected = 0.0
+
+    def sleep(self, seconds):
+        if self.backends and all(backend.status() != STATUS_CONNECTED for backend in self.backends):
+            self.disconnected += max(0.0, seconds)
+        super().sleep(seconds)
+
+
+def record_synthetic_trace(path, steps, interval=SCAN_INTERVAL):
+    """Records steps scans of the bench_switching environment through a RecordingBackend."""
+    backend = SimulatedBackend(build_environment(steps=steps))
+    recorder = RecordingBackend(backend, path)
+    try:
+        for _ in range(steps):
+            recorder.scan()
+            backend.clock.sleep(backend.scan_duration)
+            recorder.scan_results()
+            recorder.current_connection()
+            backend.clock.sleep(interval - backend.scan_duration)
+    finally:
+        recorder.close()
+
+
+def replay(trace, known_ssids, interval=SCAN_INTERVAL, single_sample=False, adaptive=False, adapters=1):
+    """
+    Runs the trace through SwitchService's own decide / connect_first / finish_cycle steps;
+    with adaptive, cycles are spaced by the service's scan schedule instead of every
+    interval. adapters simulated radios share the recorded environment.
+    """
+    clock = DowntimeClock()
+    environment = trace.environment()
+    clock.backends = [SimulatedBackend(environment, clock=clock, interface=f'sim{i}') for i in range(adapters)]
+    backend = clock.backends[0]
+    decision_latency = LatencyHistogram(DECISION_BUCKETS)
+    cpu_per_cycle = LatencyHistogram(CPU_BUCKETS)
+    cycles = switches = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        switcher = WiFiSwitcher(json_path=os.path.join(tmp, 'networks.json'), backends=clock.backends,
+                                store=CredentialStore.in_memory())
+        for ssid in known_ssids:
+            switcher.add_network(ssid, None)
+        service = SwitchService(switcher, scan_interval=interval)
+        if single_sample:
+            service.switch_policy = SwitchPolicy(service.signal_history, min_dwell=0, min_samples=1, alpha=1.0)
+            service.ranker.policy = service.switch_policy
+        schedule = service.scan_schedule
+        if trace.statuses and trace.statuses[0][1]:
+            backend.connect(trace.statuses[0][1], None)  # start where the recorded machine started
+        wall_start = time.perf_counter()
+        while clock.monotonic() <= trace.duration:
+            if adaptive and not schedule.due(clock.monotonic()):
+                clock.sleep(schedule.wait_time(clock.monotonic()))
+                if not schedule.due(clock.monotonic()):
+                    _, signal = switcher.get_current_connection(max_age=schedule.poll_interval)
+                    service.observe_link(signal)
+                continue
+            cpu_start = time.process_time()
+            current_ssid, signal = switcher.get_current_connection()
+            networks = switcher.scan_available_networks()
+            decide_start = time.perf_counter()
+            candidates, reason = service.decide(current_ssid, networks, clock.monotonic())
+            decision_latency.observe(time.perf_counter() - decide_start)
+            connected = service.connect_first(candidates) if candidates else None
+            service.finish_cycle(current_ssid, signal, candidates, reason, connected)
+            switches += connected is not None
+            cpu_per_cycle.observe(time.process_time() - cpu_start)
+            cycles += 1
+            if not adaptive:
+                clock.sleep(interval)
+        wall = time.perf_counter() - wall_start
+    return {
+        'cycles': cycles,
+        'switches': switches,
+        'simulated': clock.monotonic(),
+        'disconnected': clock.disconnected,
+        'wall': wall,
+        'decision_latency': decision_latency,
+        'cpu_per_cycle': cpu_per_cycle,
+        'decisions': service.decisions.samples(),
+        'handoffs': switcher.handoffs.value(),
+        'scan_stats': service.scan_stats() if adaptive else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('trace', nargs='?', help="trace recorded with switch_service.py --record-trace")
+    parser.add_argument('--known', nargs='*', default=None,
+                        help="SSIDs to treat as known (default: every SSID the trace was connected to)")
+    parser.add_argument('--interval', type=float, default=SCAN_INTERVAL, help="simulated seconds between cycles")
+    parser.add_argument('--steps', type=int, default=2000, help="scans in the synthetic trace")
+    parser.add_argument('--single-sample', action='store_true',
+                        help="decide off the latest scan only, like the original auto-switch loop")
+    parser.add_argument('--adaptive', action='store_true',
+                        help="space scans with the adaptive scan schedule instead of every --interval seconds")
+    parser.add_argument('--adapters', type=int, default=1,
+                        help="simulated adapters; with two or more, switches hand off make-before-break")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.trace
+        if path is None:
+            path = os.path.join(tmp, 'synthetic.jsonl')
+            record_synthetic_trace(path, args.steps)
+        trace = Trace.load(path)
+        known = args.known if args.known is not None else trace.connected_ssids() or (
+            ['Home', 'Office'] if args.trace is None else [])
+        if not known:
+            parser.error("the trace never shows a connection; name the known SSIDs with --known")
+        result = replay(trace, known, args.interval, args.single_sample, args.adaptive, args.adapters)
+
+    cycles = result['cycles']
+    print(f"trace:            {args.trace or f'synthetic ({args.steps} scans)'}, {len(trace.scans)} distinct scans")
+    print(f"known networks:   {', '.join(known)}")
+    print(f"cycles:           {cycles}")
+    print(f"switches:         {result['switches']} ({result['handoffs']} make-before-break handoffs)")
+    print(f"simulated time:   {result['simulated'] / 3600:.1f} h "
+          f"({result['simulated'] / max(result['wall'], 1e-9):,.0f}x real time)")
+    print(f"disconnected:     {result['disconnected']:.0f} s "
+          f"({100 * result['disconnected'] / max(result['simulated'], 1e-9):.2f}%)")
+    print(f"decision latency: mean={result['decision_latency'].mean() * 1e6:.1f}us "
+          f"p50<={result['decision_latency'].percentile(0.5) * 1e6:.0f}us "
+          f"p99<={result['decision_latency'].percentile(0.99) * 1e6:.0f}us")
+    print(f"cpu per cycle:    mean={result['cpu_per_cycle'].mean() * 1e6:.0f}us "
+          f"p99<={result['cpu_per_cycle'].percentile(0.99) * 1e6:.0f}us")
+    if result['scan_stats'] is not None:
+        stats = result['scan_stats']
+        print(f"scans:            {stats['active_scans']} active ({stats['early_scans']} early), "
+              f"{stats['passive_reads']} passive reads, {stats['scans_saved']} saved vs. fixed {args.interval:.0f}s")
+    for labels, count in result['decisions']:
+        print(f"decision:         {labels['decision']:<6} {labels['reason']:<18} {count}")
+
+
+if __name__ == '__main__':
+    main()
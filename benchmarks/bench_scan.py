@@ -0,0 +1,53 @@
+"""
+Measures scan_available_networks latency against a fake interface.
+Run from the repository root: python benchmarks/bench_scan.py
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backends import PyWiFiBackend
+from credential_store import CredentialStore
+import simulation
+from simulation import FakeInterface, FakeProfile
+from wifi_logic import WiFiSwitcher
+
+LEGACY_SCAN_SECONDS = 5.0  # the fixed sleep the old implementation always paid
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--scan-duration', type=float, default=0.4, help="simulated driver scan time (s)")
+    parser.add_argument('--access-points', type=int, default=40)
+    args = parser.parse_args()
+
+    access_points = [FakeProfile(ssid=f"net-{i % 15}", bssid=f"00:11:22:33:44:{i:02x}", signal=-40 - i)
+                     for i in range(args.access_points)]
+    iface = FakeInterface(access_points, scan_duration=args.scan_duration)
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = PyWiFiBackend(iface, simulation, FakeProfile)
+        switcher = WiFiSwitcher(json_path=os.path.join(tmp, 'networks.json'), backend=backend,
+                                store=CredentialStore.in_memory())
+        timings = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            networks = switcher.scan_available_networks()
+            timings.append(time.perf_counter() - start)
+            # Vary signals so every scan produces fresh results.
+            for ap in iface.access_points:
+                ap.signal -= 1
+
+    print(f"networks per scan: {len(networks)}")
+    print(f"driver scan time:  {args.scan_duration:.2f} s")
+    print(f"scan latency:      median {statistics.median(timings):.2f} s, max {max(timings):.2f} s")
+    print(f"legacy latency:    {LEGACY_SCAN_SECONDS:.2f} s (fixed sleep)")
+
+
+if __name__ == '__main__':
+    main()
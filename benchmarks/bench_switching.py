@@ -0,0 +1,88 @@
+"""
+Runs scan -> decide -> connect cycles against a simulated RF environment.
+Everything runs on a virtual clock, so this measures pure switching overhead.
+Run from the repository root: python benchmarks/bench_switching.py
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+
+from credential_store import CredentialStore
+from policy import SwitchPolicy
+from simulation import FakeProfile, RFEnvironment, SimulatedBackend
+from switch_service import SwitchService
+from wifi_logic import WiFiSwitcher
+
+SCAN_INTERVAL = 45
+NOISE_DB = 10  # per-scan jitter; single samples cross a 10 dB threshold, smoothed ones should not
+
+
+def build_environment(steps=20, period=SCAN_INTERVAL, swap_every=40, seed=1):
+    """
+    Two known networks whose mean strengths swap every `swap_every` steps, with
+    per-step noise, plus weak background networks.
+    """
+    rng = random.Random(seed)
+    timeline = []
+    for step in range(steps):
+        strong, weak = (-55, -60) if (step // swap_every) % 2 == 0 else (-60, -55)
+        access_points = [FakeProfile('Home', '00:00:00:00:00:01', strong + rng.randint(-NOISE_DB, NOISE_DB), 2437,
+                                     key='home-pass'),
+                         FakeProfile('Office', '00:00:00:00:00:02', weak + rng.randint(-NOISE_DB, NOISE_DB), 5180,
+                                     key='office-pass')]
+        access_points += [FakeProfile(f'Neighbour-{i}', f'00:00:00:00:01:{i:02x}', -80 - i, 2412) for i in range(10)]
+        timeline.append((step * period, access_points))
+    return RFEnvironment(timeline)
+
+
+def run_cycle(service):
+    """The SwitchService cycle without the asyncio plumbing, so only the switching logic is timed."""
+    switcher = service.wifi_manager
+    current_ssid, _ = switcher.get_current_connection()
+    networks = switcher.scan_available_networks()
+    candidates, _ = service.decide(current_ssid, networks, switcher.clock.monotonic())
+    return bool(candidates) and service.connect_first(candidates) is not None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--cycles', type=int, default=5000)
+    parser.add_argument('--single-sample', action='store_true',
+                        help="decide off the latest scan only, like the original auto-switch loop")
+    args = parser.parse_args()
+
+    backend = SimulatedBackend(build_environment(steps=args.cycles * 2))
+    with tempfile.TemporaryDirectory() as tmp:
+        switcher = WiFiSwitcher(json_path=os.path.join(tmp, 'networks.json'), backend=backend,
+                                store=CredentialStore.in_memory())
+        switcher.add_network('Home', 'home-pass')
+        switcher.add_network('Office', 'office-pass')
+        service = SwitchService(switcher)
+        if args.single_sample:
+            service.switch_policy = SwitchPolicy(service.signal_history, min_dwell=0, min_samples=1, alpha=1.0)
+            service.ranker.policy = service.switch_policy
+        switches = 0
+        start = time.perf_counter()
+        for _ in range(args.cycles):
+            switches += run_cycle(service)
+            backend.clock.sleep(SCAN_INTERVAL)
+        elapsed = time.perf_counter() - start
+
+    print(f"cycles:          {args.cycles}")
+    print(f"switches:        {switches}")
+    print(f"simulated time:  {backend.clock.monotonic() / 3600:.1f} h")
+    print(f"wall time:       {elapsed:.3f} s ({args.cycles / elapsed:,.0f} cycles/s)")
+    print(f"connect latency: {switcher.connect_latency.summary()}")
+    print(f"scan latency:    {switcher.scan_latency.summary()}")
+    for labels, count in service.decisions.samples():
+        print(f"decision:        {labels['decision']:<6} {labels['reason']:<18} {count}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+import logging
+import os
+import threading
+
+WATCH_INTERVAL = 0.5  # seconds between checks; changes are picked up well within a second
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigWatcher:
+    """
+    Watches one file from a single background thread by polling its size and
+    modification time (portable, no extra dependencies), and calls on_change(path)
+    whenever either changes, including when the file appears or disappears.
+    """
+
+    def __init__(self, path, on_change, interval=WATCH_INTERVAL):
+        self.path = path
+        self.on_change = on_change
+        self.interval = interval
+        self._signature = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def _read_signature(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._signature = self._read_signature()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='config-watcher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def check(self):
+        """Calls on_change if the file changed since the last check. Returns True if it did."""
+        signature = self._read_signature()
+        if signature == self._signature:
+            return False
+        self._signature = signature
+        self.on_change(self.path)
+        return True
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.warning(f"⚠️ Could not apply changes from {self.path}: {e}")
@@ -0,0 +1,284 @@
+import argparse
+import ctypes
+import json
+import os
+import sqlite3
+import threading
+
+KEY_ENV_VAR = 'WIFI_SWITCHER_KEY'
+DEFAULT_PRIORITY = 99
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS networks (
+    ssid        TEXT PRIMARY KEY,
+    ssid_folded TEXT NOT NULL,
+    type        TEXT NOT NULL DEFAULT 'home',
+    priority    INTEGER NOT NULL DEFAULT 99,
+    username    TEXT,
+    secret      BLOB
+);
+CREATE INDEX IF NOT EXISTS networks_ssid_folded ON networks (ssid_folded);
+CREATE TABLE IF NOT EXISTS settings (
+    key   TEXT PRIMARY KEY,
+    value BLOB
+);
+"""
+
+
+class _DataBlob(ctypes.Structure):
+    _fields_ = [('cbData', ctypes.c_ulong), ('pbData', ctypes.POINTER(ctypes.c_char))]
+
+
+class DPAPICipher:
+    """Windows DPAPI: secrets are bound to the current user account, so no key file is needed."""
+    _CRYPTPROTECT_UI_FORBIDDEN = 0x1
+
+    def __init__(self):
+        self._crypt32 = ctypes.windll.crypt32
+        self._kernel32 = ctypes.windll.kernel32
+
+    def _transform(self, function, data):
+        buffer = ctypes.create_string_buffer(data, len(data))
+        blob_in = _DataBlob(len(data), ctypes.cast(buffer, ctypes.POINTER(ctypes.c_char)))
+        blob_out = _DataBlob()
+        if not function(ctypes.byref(blob_in), None, None, None, None,
+                        self._CRYPTPROTECT_UI_FORBIDDEN, ctypes.byref(blob_out)):
+            raise ctypes.WinError()
+        try:
+            return ctypes.string_at(blob_out.pbData, blob_out.cbData)
+        finally:
+            self._kernel32.LocalFree(blob_out.pbData)
+
+    def encrypt(self, data):
+        return self._transform(self._crypt32.CryptProtectData, data)
+
+    def decrypt(self, token):
+        return self._transform(self._crypt32.CryptUnprotectData, token)
+
+
+class FernetCipher:
+    """
+    AES (Fernet, from the 'cryptography' package in requirements.txt). The key comes from the
+    WIFI_SWITCHER_KEY environment variable, or from a key file created with 0600 permissions.
+    """
+
+    def __init__(self, key_path):
+        from cryptography.fernet import Fernet
+        key = os.environ.get(KEY_ENV_VAR)
+        if key is None:
+            key = self._load_or_create_key(key_path, Fernet.generate_key)
+        self._fernet = Fernet(key)
+
+    @staticmethod
+    def _load_or_create_key(key_path, generate_key):
+        try:
+            fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            with open(key_path, 'rb') as f:
+                return f.read().strip()
+        key = generate_key()
+        with os.fdopen(fd, 'wb') as f:
+            f.write(key)
+        return key
+
+    def encrypt(self, data):
+        return self._fernet.encrypt(data)
+
+    def decrypt(self, token):
+        return self._fernet.decrypt(token)
+
+
+class _InMemoryCipher:
+    """Identity transform for stores that never touch disk."""
+
+    def encrypt(self, data):
+        return data
+
+    def decrypt(self, token):
+        return token
+
+
+def default_cipher(db_path):
+    """DPAPI on Windows, otherwise Fernet; raises RuntimeError if 'cryptography' is missing there."""
+    if os.name == 'nt':
+        return DPAPICipher()
+    try:
+        return FernetCipher(db_path + '.key')
+    except ImportError:
+        raise RuntimeError("Encrypting stored credentials needs the 'cryptography' package on this "
+                           "platform (pip install cryptography).") from None
+
+
+class CredentialStore:
+    """
+    Known networks in SQLite, with passwords encrypted at rest. Every change is a
+    single-row upsert or delete, bulk imports run in one transaction, and an
+    in-memory index serves exact and case-insensitive SSID lookups without queries.
+    """
+
+    def __init__(self, path, cipher=None):
+        self.path = path
+        self.cipher = cipher or default_cipher(path)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        if path != ':memory:':
+            self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript(_SCHEMA)
+        self._records = {}
+        self._folded = {}
+        self._load()
+
+    @classmethod
+    def in_memory(cls):
+        """A throwaway store for simulations and benchmarks; nothing is written to disk."""
+        return cls(':memory:', cipher=_InMemoryCipher())
+
+    def _load(self):
+        rows = self._db.execute('SELECT ssid, type, priority, username, secret FROM networks').fetchall()
+        for ssid, network_type, priority, username, secret in rows:
+            self._index(ssid, {
+                "password": self._decrypt(secret),
+                "type": network_type,
+                "priority": priority,
+                "username": username,
+            })
+
+    def _encrypt(self, password):
+        return None if password is None else self.cipher.encrypt(password.encode('utf-8'))
+
+    def _decrypt(self, secret):
+        return None if secret is None else self.cipher.decrypt(bytes(secret)).decode('utf-8')
+
+    def _index(self, ssid, record):
+        if ssid not in self._records:
+            self._folded.setdefault(ssid.casefold(), []).append(ssid)
+        self._records[ssid] = record
+
+    def _unindex(self, ssid):
+        del self._records[ssid]
+        matches = self._folded[ssid.casefold()]
+        matches.remove(ssid)
+        if not matches:
+            del self._folded[ssid.casefold()]
+
+    @staticmethod
+    def _normalize(details):
+        try:
+            priority = int(details['priority']) if details.get('priority') is not None else DEFAULT_PRIORITY
+        except (TypeError, ValueError):
+            priority = DEFAULT_PRIORITY
+        return {
+            "password": details.get('password'),
+            "type": details.get('type') or 'home',
+            "priority": priority,
+            "username": details.get('username'),
+        }
+
+    def _row(self, ssid, record):
+        return (ssid, ssid.casefold(), record['type'], record['priority'], record['username'],
+                self._encrypt(record['password']))
+
+    def get(self, ssid):
+        """Exact, case-sensitive lookup. Returns a copy of the record or None."""
+        record = self._records.get(ssid)
+        return dict(record) if record is not None else None
+
+    def lookup(self, ssid):
+        """Case-insensitive lookup: SSIDs matching ssid ignoring case, an exact match first."""
+        matches = list(self._folded.get(ssid.casefold(), ()))
+        matches.sort(key=lambda candidate: candidate != ssid)
+        return matches
+
+    def upsert(self, ssid, details):
+        record = self._normalize(details)
+        with self._lock, self._db:
+            self._db.execute('INSERT OR REPLACE INTO networks VALUES (?, ?, ?, ?, ?, ?)', self._row(ssid, record))
+            self._index(ssid, record)
+
+    def delete(self, ssid):
+        """Removes ssid; returns False if it was not stored."""
+        with self._lock, self._db:
+            if ssid not in self._records:
+                return False
+            self._db.execute('DELETE FROM networks WHERE ssid = ?', (ssid,))
+            self._unindex(ssid)
+            return True
+
+    def import_many(self, networks):
+        """Upserts every {ssid: details} entry in one transaction. Returns the number imported."""
+        records = [(ssid, self._normalize(details)) for ssid, details in networks.items()]
+        with self._lock, self._db:
+            self._db.executemany('INSERT OR REPLACE INTO networks VALUES (?, ?, ?, ?, ?, ?)',
+                                 [self._row(ssid, record) for ssid, record in records])
+            for ssid, record in records:
+                self._index(ssid, record)
+        return len(records)
+
+    def provisioned(self):
+        """The networks.json content last recorded by apply_provisioning(), or None if it never ran."""
+        row = self._db.execute("SELECT value FROM settings WHERE key = 'provisioned'").fetchone()
+        return None if row is None else json.loads(self._decrypt(row[0]))
+
+    def apply_provisioning(self, networks, changed, removed):
+        """
+        Upserts changed, deletes removed and records networks (encrypted, like the secrets)
+        as the provisioning file now applied, all in one transaction.
+        """
+        records = [(ssid, self._normalize(details)) for ssid, details in changed.items()]
+        with self._lock, self._db:
+            self._db.executemany('INSERT OR REPLACE INTO networks VALUES (?, ?, ?, ?, ?, ?)',
+                                 [self._row(ssid, record) for ssid, record in records])
+            self._db.executemany('DELETE FROM networks WHERE ssid = ?', [(ssid,) for ssid in removed])
+            self._db.execute("INSERT OR REPLACE INTO settings VALUES ('provisioned', ?)",
+                             (self._encrypt(json.dumps(networks)),))
+            for ssid, record in records:
+                self._index(ssid, record)
+            for ssid in removed:
+                if ssid in self._records:
+                    self._unindex(ssid)
+
+    def import_json(self, json_path):
+        with open(json_path, 'r') as f:
+            return self.import_many(json.load(f))
+
+    def as_dict(self):
+        """Returns {ssid: details} for every stored network (copies, safe to mutate)."""
+        return {ssid: dict(record) for ssid, record in self._records.items()}
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, ssid):
+        return ssid in self._records
+
+    def close(self):
+        self._db.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the encrypted known-networks store.")
+    parser.add_argument('--db', default='networks.db')
+    commands = parser.add_subparsers(dest='command', required=True)
+    import_parser = commands.add_parser('import', help="bulk-import a networks.json-style file")
+    import_parser.add_argument('json_path')
+    commands.add_parser('list', help="list stored SSIDs (no passwords)")
+    find_parser = commands.add_parser('find', help="case-insensitive SSID lookup")
+    find_parser.add_argument('ssid')
+    args = parser.parse_args(argv)
+
+    store = CredentialStore(args.db)
+    try:
+        if args.command == 'import':
+            print(f"✅ Imported {store.import_json(args.json_path)} networks into {args.db}")
+        elif args.command == 'list':
+            for ssid, details in sorted(store.as_dict().items()):
+                print(f"{ssid}\t{details['type']}\tpriority {details['priority']}")
+        elif args.command == 'find':
+            for ssid in store.lookup(args.ssid):
+                print(ssid)
+    finally:
+        store.close()
+
+
+if __name__ == '__main__':
+    main()
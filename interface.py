@@ -1,17 +1,33 @@
 import customtkinter
-import threading
-import time
+import logging
+import queue
 from plyer import notification
+from metrics import LogBuffer
+from network_list import NetworkListView
+from scheduler import TaskScheduler
+from switch_service import SwitchService
 from wifi_logic import WiFiSwitcher
 
+LOG_TEXTBOX_LINES = 300  # older lines are dropped from the log box
+UI_QUEUE_POLL_MS = 100   # how often the main loop runs callbacks queued by other threads
+
+logger = logging.getLogger('wifi_switcher.gui')
+
 class App(customtkinter.CTk):
     def __init__(self):
         super().__init__()
 
         # --- 1. Initialize variables ---
+        self.log_buffer = LogBuffer()
+        self.log_sequence = 0
+        self.ui_queue = queue.SimpleQueue()  # (callback, args) from other threads, run by the main loop
+        logging.getLogger().addHandler(self.log_buffer)
+        logging.getLogger().setLevel(logging.INFO)
         self.wifi_manager = WiFiSwitcher()
-        self.auto_switch_thread = None
-        self.stop_thread_event = threading.Event()
+        self.scheduler = TaskScheduler()
+        self.switch_service = SwitchService(self.wifi_manager, scheduler=self.scheduler)
+        self.switch_service.subscribe(self.on_service_event)
+        self.wifi_manager.add_config_listener(self.on_config_changed)
         self.auto_switch_var = customtkinter.BooleanVar(value=False)
 
         # --- 2. Configure the main window ---
@@ -29,8 +45,12 @@ class App(customtkinter.CTk):
         self.log_textbox.grid(row=3, column=0, padx=10, pady=(0, 10), sticky="ew")
 
         # --- 4. Start background tasks ---
+        self.wifi_manager.start_status_monitors()
+        self.wifi_manager.start_watching()
         self.after(500, self.start_threaded_scan)
         self.after(1000, self.schedule_periodic_status_check)
+        self.after(250, self.drain_log_buffer)
+        self.after(UI_QUEUE_POLL_MS, self.drain_ui_queue)
 
     # --- UI Creation Methods ---
     def create_status_frame(self):
@@ -55,6 +75,7 @@ class App(customtkinter.CTk):
         self.scrollable_networks_frame = customtkinter.CTkScrollableFrame(networks_main_frame, label_text="Available Networks")
         self.scrollable_networks_frame.grid(row=0, column=0, padx=5, pady=5, sticky="nsew")
         self.scrollable_networks_frame.grid_columnconfigure(0, weight=1)
+        self.networks_view = NetworkListView(self.scrollable_networks_frame, [("Connect", self.start_threaded_connect, 140)], button_padx=10)
 
     def create_controls_frame(self):
         self.controls_frame = customtkinter.CTkFrame(self)
@@ -82,19 +103,12 @@ class App(customtkinter.CTk):
         scrollable_frame = customtkinter.CTkScrollableFrame(self.management_window, label_text="Saved Networks")
         scrollable_frame.pack(padx=20, pady=20, fill="both", expand=True)
         scrollable_frame.grid_columnconfigure(0, weight=1)
+        saved_networks_view = NetworkListView(scrollable_frame, [
+            ("Edit", lambda s: self.open_settings_window(ssid_to_edit=s), 80),
+            ("Remove", lambda s: remove_network_and_refresh(s), 80),
+        ])
         def refresh_network_list():
-            for widget in scrollable_frame.winfo_children():
-                widget.destroy()
-            for i, ssid in enumerate(sorted(self.wifi_manager.known_networks.keys())):
-                network_frame = customtkinter.CTkFrame(scrollable_frame)
-                network_frame.grid(row=i, column=0, padx=5, pady=5, sticky="ew")
-                network_frame.grid_columnconfigure(0, weight=1)
-                label = customtkinter.CTkLabel(network_frame, text=ssid, anchor="w")
-                label.grid(row=0, column=0, padx=10, pady=5, sticky="w")
-                remove_button = customtkinter.CTkButton(network_frame, text="Remove", width=80, command=lambda s=ssid: remove_network_and_refresh(s))
-                remove_button.grid(row=0, column=2, padx=5, pady=5)
-                edit_button = customtkinter.CTkButton(network_frame, text="Edit", width=80, command=lambda s=ssid: self.open_settings_window(ssid_to_edit=s))
-                edit_button.grid(row=0, column=1, padx=5, pady=5)
+            saved_networks_view.update([(ssid, ssid, True) for ssid in sorted(self.wifi_manager.known_networks.keys())])
         def remove_network_and_refresh(ssid):
             if self.wifi_manager.remove_network(ssid):
                 self.log_message(f"Network '{ssid}' removed.")
@@ -142,7 +156,8 @@ class App(customtkinter.CTk):
         username_entry.pack(pady=(0, 10), fill="x")
         customtkinter.CTkLabel(main_frame, text="Priority (lower number is higher):").pack(anchor="w")
         priority_entry = customtkinter.CTkEntry(main_frame)
-        priority_entry.insert(0, str(network_details.get("priority") or ""))
+        priority = network_details.get("priority")
+        priority_entry.insert(0, "" if priority is None else str(priority))
         priority_entry.pack(pady=(0, 20), fill="x")
         def save_network():
             ssid = ssid_entry.get()
@@ -151,7 +166,10 @@ class App(customtkinter.CTk):
             username = username_entry.get() or None
             priority_str = priority_entry.get() or "99"
             if ssid and password:
-                self.wifi_manager.add_network(ssid, password, network_type, int(priority_str), username)
+                if not self.wifi_manager.add_network(ssid, password, network_type, int(priority_str), username):
+                    self.log_message(f"Error: network '{ssid}' was NOT saved; see the log above.")
+                    notification.notify(title="Network Not Saved", message=f"Could not save credentials for {ssid}.", timeout=10)
+                    return
                 self.log_message(f"Network '{ssid}' saved!")
                 title = "Network Updated" if ssid_to_edit else "New Network Added"
                 notification.notify(title=title, message=f"Successfully saved credentials for {ssid}.", timeout=10)
@@ -167,119 +185,115 @@ class App(customtkinter.CTk):
 
     # --- Logic and Utility Methods ---
     def log_message(self, message):
-        self.log_textbox.configure(state="normal")
-        self.log_textbox.insert("end", f"[{time.strftime('%H:%M:%S')}] {message}\n")
-        self.log_textbox.configure(state="disabled")
-        self.log_textbox.see("end")
+        # Safe from any thread: lines reach the textbox through the log buffer.
+        logger.info(message)
+
+    def drain_log_buffer(self):
+        self.log_sequence, lines = self.log_buffer.lines_since(self.log_sequence)
+        if lines:
+            self.log_textbox.configure(state="normal")
+            self.log_textbox.insert("end", "\n".join(lines) + "\n")
+            excess = int(self.log_textbox.index("end-1c").split(".")[0]) - 1 - LOG_TEXTBOX_LINES
+            if excess > 0:
+                self.log_textbox.delete("1.0", f"{excess + 1}.0")
+            self.log_textbox.configure(state="disabled")
+            self.log_textbox.see("end")
+        self.after(250, self.drain_log_buffer)
+
+    def run_on_ui(self, callback, *args):
+        # Never blocks, unlike after() from a worker thread, so workers cannot deadlock with the main loop.
+        self.ui_queue.put((callback, args))
+
+    def drain_ui_queue(self):
+        while True:
+            try:
+                callback, args = self.ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            callback(*args)
+        self.after(UI_QUEUE_POLL_MS, self.drain_ui_queue)
 
     def toggle_auto_switch_thread(self):
         if self.auto_switch_var.get():
-            self.stop_thread_event.clear()
-            self.auto_switch_thread = threading.Thread(target=self._auto_switch_loop, daemon=True)
-            self.auto_switch_thread.start()
+            self.switch_service.start_in_thread()
             self.log_message("▶️ Automatic switching enabled.")
         else:
-            self.stop_thread_event.set()
-            self.log_message("⏹️ Automatic switching disabled.")
+            # Bounded wait: service events reach Tk through ui_queue, so the service thread never waits on us.
+            if self.switch_service.stop_thread(timeout=1.0):
+                self.log_message("⏹️ Automatic switching disabled.")
+            else:
+                self.log_message("⏹️ Automatic switching is stopping...")
 
-    def _auto_switch_loop(self):
-        SWITCH_THRESHOLD = 10
-        SCAN_INTERVAL = 45
-        while not self.stop_thread_event.is_set():
-            try:
-                self.log_message("⚙️ Auto-scan running...")
-                current_ssid, _ = self.wifi_manager.get_current_connection()
-                available_networks_dict = self.wifi_manager.scan_available_networks()
-                if not available_networks_dict:
-                    time.sleep(SCAN_INTERVAL)
-                    continue
-                current_signal_dbm = None
-                if current_ssid and current_ssid in available_networks_dict:
-                    current_signal_dbm = available_networks_dict[current_ssid].get('signal')
-                valid_networks = [item for item in available_networks_dict.items() if 'signal' in item[1]]
-                if not valid_networks:
-                    time.sleep(SCAN_INTERVAL)
-                    continue
-                best_net_item = sorted(valid_networks, key=lambda item: item[1]['signal'], reverse=True)[0]
-                best_ssid = best_net_item[0]
-                if best_ssid not in self.wifi_manager.known_networks:
-                    time.sleep(SCAN_INTERVAL)
-                    continue
-                best_signal_dbm = best_net_item[1]['signal']
-                if current_ssid and current_signal_dbm is not None:
-                    if current_ssid == best_ssid:
-                        self.log_message(f"✅ Already on the best network: {current_ssid}")
-                    elif best_signal_dbm > (current_signal_dbm + SWITCH_THRESHOLD):
-                        notification.notify(title="Smart Wi-Fi Switcher", message=f"Switching to {best_ssid} for a better signal.", timeout=10)
-                        self.start_threaded_connect(best_ssid)
-                elif self.wifi_manager.known_networks:
-                    best_known_ssid = best_net_item[0]
-                    notification.notify(title="Smart Wi-Fi Switcher", message=f"Connecting to best available network: {best_known_ssid}", timeout=10)
-                    self.start_threaded_connect(best_known_ssid)
-            except Exception as e:
-                self.log_message(f"Error in auto-switch loop: {e}")
-            time.sleep(SCAN_INTERVAL)
+    def on_service_event(self, event, data):
+        """Receives switch-service events on the service thread and forwards them to the UI without blocking."""
+        if event == 'log':
+            self.log_message(data['message'])
+        elif event == 'scan':
+            self.run_on_ui(self.populate_networks_frame, data['networks'])
+        elif event == 'switch':
+            message = f"Switching to {data['to']} for a better signal." if data['from'] else f"Connecting to best available network: {data['to']}"
+            notification.notify(title="Smart Wi-Fi Switcher", message=message, timeout=10)
+        elif event == 'connected':
+            self.log_message(f"Successfully connected to {data['ssid']}!")
+        elif event == 'connect_failed':
+            self.log_message(f"Failed to connect to {data['ssid']}.")
+
+    def on_config_changed(self, known_networks):
+        """Called from whichever thread changed the saved networks; re-marks known networks in the last scan."""
+        self.run_on_ui(self.populate_networks_frame, self.wifi_manager.last_scan.to_networks_dict())
 
     def start_threaded_scan(self):
-        self.log_message("Starting network scan...")
-        thread = threading.Thread(target=self.update_networks_list, daemon=True)
-        thread.start()
+        # Joins a scan already in flight (manual, filter toggle or auto-switch) instead of starting another.
+        if not self.scheduler.in_flight('scan'):
+            self.log_message("Starting network scan...")
+        future = self.scheduler.submit('scan', self.wifi_manager.scan_available_networks)
+        future.add_done_callback(self.on_scan_done)
 
-    def update_networks_list(self):
-        available_networks = self.wifi_manager.scan_available_networks()
-        self.after(0, self.populate_networks_frame, available_networks)
+    def on_scan_done(self, future):
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            self.log_message(f"Scan failed: {future.exception()}")
+            return
+        self.after(0, self.populate_networks_frame, future.result())
 
     def populate_networks_frame(self, available_networks):
-        for widget in self.scrollable_networks_frame.winfo_children():
-            widget.destroy()
         networks_to_display = available_networks
         if self.filter_known_checkbox.get():
             networks_to_display = {ssid: details for ssid, details in available_networks.items() if ssid in self.wifi_manager.known_networks}
-        for i, (ssid, details) in enumerate(networks_to_display.items()):
-            network_frame = customtkinter.CTkFrame(self.scrollable_networks_frame)
-            network_frame.grid(row=i, column=0, padx=5, pady=5, sticky="ew")
-            network_frame.grid_columnconfigure(0, weight=1)
-            signal_strength = details.get('signal', 'N/A')
-            label = customtkinter.CTkLabel(network_frame, text=f"{ssid} ({signal_strength} dBm)")
-            label.grid(row=0, column=0, padx=10, pady=5, sticky="w")
-            if ssid in self.wifi_manager.known_networks:
-                connect_button = customtkinter.CTkButton(network_frame, text="Connect", command=lambda s=ssid: self.start_threaded_connect(s))
-                connect_button.grid(row=0, column=1, padx=10, pady=5)
-        self.log_message(f"Scan complete. Found {len(networks_to_display)} networks.")
+        ordered = sorted(networks_to_display.items(), key=lambda item: item[1].get('signal', -200), reverse=True)
+        self.networks_view.update([(ssid, self.format_network_label(ssid, details), ssid in self.wifi_manager.known_networks)
+                                   for ssid, details in ordered])
+        self.log_message(f"Scan complete. Found {len(networks_to_display)} networks (rendered in {self.networks_view.last_refresh_ms:.0f} ms).")
 
-    def start_threaded_connect(self, ssid):
-        self.log_message(f"Attempting to connect to {ssid}...")
-        thread = threading.Thread(target=self.perform_connection, args=(ssid,), daemon=True)
-        thread.start()
+    @staticmethod
+    def format_network_label(ssid, details):
+        text = f"{ssid} ({details.get('signal', 'N/A')} dBm"
+        if details.get('ap_count', 1) > 1:
+            text += f", {details['ap_count']} APs"
+        if details.get('bands'):
+            text += f", {'/'.join(details['bands'])}"
+        return text + ")"
 
-    def perform_connection(self, ssid):
-        network_details = self.wifi_manager.known_networks.get(ssid)
-        if not network_details:
+    def start_threaded_connect(self, ssids):
+        """Connects to ssids in order (a single SSID or a ranked list), superseding any connect in progress."""
+        if isinstance(ssids, str):
+            ssids = [ssids]
+        self.scheduler.submit_latest('connect', self.perform_connections, list(ssids))
+
+    def perform_connections(self, ssids, cancel_event=None):
+        missing = [ssid for ssid in ssids if ssid not in self.wifi_manager.known_networks]
+        for ssid in missing:
             self.log_message(f"Error: Could not find details for known network '{ssid}'.")
-            return
-        network_type = network_details.get('type', 'home')
-        success = False
-        if network_type == 'enterprise':
-            username = network_details.get('username')
-            password = network_details.get('password')
-            success = self.wifi_manager.connect_to_enterprise_network(ssid, username, password)
-        else:
-            password = network_details.get('password')
-            success = self.wifi_manager.connect_to_network(ssid, password)
-        if success:
-            self.log_message(f"Successfully connected to {ssid}!")
-        else:
-            self.log_message(f"Failed to connect to {ssid}.")
-        self.after(0, self.start_threaded_scan)
+        self.switch_service.connect_first([ssid for ssid in ssids if ssid not in missing], cancel_event)
+        if not cancel_event.is_set():
+            self.after(0, self.start_threaded_scan)
 
     def schedule_periodic_status_check(self):
-        thread = threading.Thread(target=self.fetch_and_update_status, daemon=True)
-        thread.start()
-        self.after(5000, self.schedule_periodic_status_check)
-
-    def fetch_and_update_status(self):
-        current_ssid, current_signal = self.wifi_manager.get_current_connection()
-        self.after(0, self.update_status_labels, current_ssid, current_signal)
+        # The status monitor refreshes on its own thread; this only reads its cached snapshot.
+        snapshot = self.wifi_manager.status_monitor.snapshot()
+        self.update_status_labels(snapshot.ssid, snapshot.signal)
+        self.after(1000, self.schedule_periodic_status_check)
 
     def update_status_labels(self, ssid, signal):
         if signal is not None:
@@ -0,0 +1,250 @@
+import bisect
+import collections
+import json
+import logging
+import logging.handlers
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_LATENCY_BUCKETS = (0.25, 0.5, 1.0, 1.5, 2.0, 3.0, 5.0, 8.0, 12.0, 20.0, 30.0)
+LOG_BUFFER_LINES = 500            # log lines kept in memory for the GUI
+EXPORT_INTERVAL = 60.0            # seconds between JSON-lines snapshots
+EXPORT_MAX_BYTES = 1024 * 1024    # rotate the JSON-lines file at this size
+EXPORT_BACKUP_COUNT = 3
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram in seconds; the last bucket catches everything above the bounds."""
+
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self.count += 1
+            self.sum += seconds
+
+    def percentile(self, fraction):
+        """Returns the upper bound of the bucket holding the given fraction (0-1) of samples."""
+        with self._lock:
+            if not self.count:
+                return None
+            target = fraction * self.count
+            seen = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), self.counts):
+                seen += bucket_count
+                if seen >= target:
+                    return bound
+        return float('inf')
+
+    def mean(self):
+        return self.sum / self.count if self.count else None
+
+    def summary(self):
+        if not self.count:
+            return "no samples"
+        return (f"n={self.count} mean={self.mean():.2f}s "
+                f"p50<={self.percentile(0.5)}s p90<={self.percentile(0.9)}s")
+
+    def snapshot(self):
+        with self._lock:
+            return {'count': self.count, 'sum': round(self.sum, 6),
+                    'buckets': dict(zip([str(bound) for bound in self.buckets] + ['+Inf'], self.counts))}
+
+
+class Counter:
+    """A monotonic count, optionally split by labels, e.g. inc(outcome='timeout')."""
+
+    def __init__(self, label_names=()):
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        """The count for one label combination, or the total across all of them if none is given."""
+        with self._lock:
+            if not labels:
+                return sum(self._values.values())
+            key = tuple(str(labels.get(name, '')) for name in self.label_names)
+            return self._values.get(key, 0)
+
+    def samples(self):
+        """Returns [(labels_dict, count), ...]."""
+        with self._lock:
+            return [(dict(zip(self.label_names, key)), count) for key, count in sorted(self._values.items())]
+
+    def snapshot(self):
+        if not self.label_names:
+            return self.value()
+        return {','.join(f"{name}={value}" for name, value in labels.items()): count
+                for labels, count in self.samples()}
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+               for value in labels.values())
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + '}'
+
+
+class MetricsRegistry:
+    """
+    Named counters and latency histograms for one switcher. Metrics are created on
+    first use and shared afterwards, so instrumented code just asks for them by name.
+    """
+
+    def __init__(self):
+        self._metrics = {}  # name -> (kind, help_text, metric)
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, name, kind, help_text, factory):
+        with self._lock:
+            entry = self._metrics.get(name)
+            if entry is None:
+                entry = self._metrics[name] = (kind, help_text, factory())
+            elif entry[0] != kind:
+                raise ValueError(f"Metric '{name}' is already registered as a {entry[0]}")
+            return entry[2]
+
+    def counter(self, name, help_text='', label_names=()):
+        return self._get_or_create(name, 'counter', help_text, lambda: Counter(label_names))
+
+    def histogram(self, name, help_text='', buckets=DEFAULT_LATENCY_BUCKETS):
+        return self._get_or_create(name, 'histogram', help_text, lambda: LatencyHistogram(buckets))
+
+    def get(self, name):
+        entry = self._metrics.get(name)
+        return entry[2] if entry is not None else None
+
+    def snapshot(self):
+        """Returns {name: value} for every metric, suitable for JSON."""
+        with self._lock:
+            entries = sorted(self._metrics.items())
+        return {name: metric.snapshot() for name, (_, _, metric) in entries}
+
+    def render_prometheus(self):
+        """Returns every metric in the Prometheus text exposition format."""
+        with self._lock:
+            entries = sorted(self._metrics.items())
+        lines = []
+        for name, (kind, help_text, metric) in entries:
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == 'counter':
+                samples = metric.samples() or [({}, 0)]
+                lines.extend(f"{name}{_format_labels(labels)} {count}" for labels, count in samples)
+                continue
+            snapshot = metric.snapshot()
+            cumulative = 0
+            for bound, bucket_count in snapshot['buckets'].items():
+                cumulative += bucket_count
+                lines.append(f'{name}_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f"{name}_sum {snapshot['sum']}")
+            lines.append(f"{name}_count {snapshot['count']}")
+        return '\n'.join(lines) + '\n'
+
+
+def serve_prometheus(registry, port, host='127.0.0.1'):
+    """Serves registry at http://host:port/metrics from a daemon thread. Returns the server; call shutdown() to stop."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] not in ('/', '/metrics'):
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # scrapes every few seconds would drown the log
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+    return server
+
+
+class JsonLinesExporter:
+    """
+    Appends a snapshot of the registry as one JSON object per line every interval
+    seconds, rotating the file once it reaches max_bytes.
+    """
+
+    def __init__(self, registry, path, interval=EXPORT_INTERVAL, max_bytes=EXPORT_MAX_BYTES,
+                 backup_count=EXPORT_BACKUP_COUNT):
+        self.registry = registry
+        self.interval = interval
+        self._handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes,
+                                                             backupCount=backup_count, encoding='utf-8')
+        self._handler.setFormatter(logging.Formatter('%(message)s'))
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def export(self):
+        line = json.dumps({'time': time.time(), 'metrics': self.registry.snapshot()})
+        self._handler.emit(logging.makeLogRecord({'msg': line, 'levelno': logging.INFO}))
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='metrics-export', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops the export thread after writing one final snapshot."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.export()
+        self._handler.close()
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self.export()
+
+
+class LogBuffer(logging.Handler):
+    """
+    Keeps the last capacity formatted log lines in memory. Any thread may log;
+    a reader polls lines_since() with the sequence number it last saw.
+    """
+
+    def __init__(self, capacity=LOG_BUFFER_LINES):
+        super().__init__()
+        self.setFormatter(logging.Formatter('[%(asctime)s] %(message)s', datefmt='%H:%M:%S'))
+        self._lines = collections.deque(maxlen=capacity)
+        self._sequence = 0
+        self._lines_lock = threading.Lock()
+
+    def emit(self, record):
+        try:
+            line = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        with self._lines_lock:
+            self._sequence += 1
+            self._lines.append(line)
+
+    def lines_since(self, sequence):
+        """Returns (latest_sequence, new_lines); lines that already fell out of the buffer are skipped."""
+        with self._lines_lock:
+            missed = min(self._sequence - sequence, len(self._lines))
+            return self._sequence, list(self._lines)[len(self._lines) - missed:] if missed > 0 else []
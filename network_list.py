@@ -0,0 +1,122 @@
+import time
+
+import customtkinter
+
+MAX_VISIBLE_ROWS = 40   # rows materialised before the rest go behind "Show more"
+PAGE_SIZE = 40
+
+
+class _Row:
+    """Widgets for one list row. Rows are recycled between keys instead of destroyed."""
+    __slots__ = ('frame', 'label', 'buttons', 'key', 'text', 'show_actions', 'position')
+
+    def __init__(self, frame, label, buttons):
+        self.frame = frame
+        self.label = label
+        self.buttons = buttons
+        self.key = None
+        self.text = None
+        self.show_actions = None
+        self.position = None
+
+
+class NetworkListView:
+    """
+    A keyed list of rows inside a scrollable frame, updated incrementally.
+    update() only relabels rows whose text changed, re-grids rows whose position
+    changed and hides rows that disappeared (keeping them for reuse), so a refresh
+    costs time proportional to what changed rather than to the list size.
+    Only the first max_rows rows are materialised; a "Show more" button pages in the rest.
+
+    actions is a list of (button_text, callback, width); callbacks receive the row key.
+    """
+
+    def __init__(self, parent, actions, max_rows=MAX_VISIBLE_ROWS, page_size=PAGE_SIZE, button_padx=5):
+        self.parent = parent
+        self.actions = actions
+        self.max_rows = max_rows
+        self.page_size = page_size
+        self.button_padx = button_padx
+        self.last_refresh_ms = 0.0
+        self._rows = {}      # key -> visible _Row
+        self._spare = []     # hidden rows ready for reuse
+        self._items = []
+        self._more_button = None
+
+    def _build_row(self):
+        frame = customtkinter.CTkFrame(self.parent)
+        frame.grid_columnconfigure(0, weight=1)
+        label = customtkinter.CTkLabel(frame, text="", anchor="w")
+        label.grid(row=0, column=0, padx=10, pady=5, sticky="w")
+        row = _Row(frame, label, [])
+        for text, callback, width in self.actions:
+            button = customtkinter.CTkButton(frame, text=text, width=width,
+                                             command=lambda r=row, cb=callback: cb(r.key))
+            row.buttons.append(button)
+        return row
+
+    def _show_actions(self, row, show):
+        for column, button in enumerate(row.buttons, start=1):
+            if show:
+                button.grid(row=0, column=column, padx=self.button_padx, pady=5)
+            else:
+                button.grid_remove()
+        row.show_actions = show
+
+    def update(self, items):
+        """
+        Shows items, an ordered list of (key, text, show_actions) tuples.
+        Returns a dict counting added, removed, relabelled and moved rows.
+        """
+        start = time.perf_counter()
+        self._items = list(items)
+        visible = self._items[:self.max_rows]
+        visible_keys = {key for key, _, _ in visible}
+        stats = {'added': 0, 'removed': 0, 'relabelled': 0, 'moved': 0}
+
+        for key in [key for key in self._rows if key not in visible_keys]:
+            row = self._rows.pop(key)
+            row.frame.grid_remove()
+            row.position = None
+            self._spare.append(row)
+            stats['removed'] += 1
+
+        for position, (key, text, show_actions) in enumerate(visible):
+            row = self._rows.get(key)
+            if row is None:
+                row = self._spare.pop() if self._spare else self._build_row()
+                row.key = key
+                self._rows[key] = row
+                stats['added'] += 1
+            if row.text != text:
+                row.label.configure(text=text)
+                row.text = text
+                stats['relabelled'] += 1
+            if row.show_actions != show_actions:
+                self._show_actions(row, show_actions)
+            if row.position != position:
+                row.frame.grid(row=position, column=0, padx=5, pady=5, sticky="ew")
+                row.position = position
+                stats['moved'] += 1
+
+        self._update_more_button(len(visible))
+        self.last_refresh_ms = (time.perf_counter() - start) * 1000
+        return stats
+
+    def _update_more_button(self, shown):
+        hidden = len(self._items) - shown
+        if hidden <= 0:
+            if self._more_button is not None:
+                self._more_button.grid_remove()
+            return
+        if self._more_button is None:
+            self._more_button = customtkinter.CTkButton(self.parent, text="", command=self._show_more)
+        self._more_button.configure(text=f"Show {min(hidden, self.page_size)} more ({hidden} hidden)")
+        self._more_button.grid(row=shown, column=0, padx=5, pady=5)
+
+    def _show_more(self):
+        self.max_rows += self.page_size
+        self.update(self._items)
+
+    def __len__(self):
+        return len(self._items)
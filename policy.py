@@ -0,0 +1,129 @@
+SWITCH_MARGIN_DB = 10         # smoothed advantage a candidate needs over the current network
+MIN_DWELL_SECONDS = 120.0     # minimum time on a network before switching away again
+MIN_CANDIDATE_SAMPLES = 2     # readings of a candidate required before it can win
+EWMA_ALPHA = 0.4
+
+
+class SwitchPolicy:
+    """
+    Decides whether to leave the current network based on smoothed signal history
+    instead of a single scan, with hysteresis (a dB margin) and a minimum dwell time.
+    """
+
+    def __init__(self, history, margin=SWITCH_MARGIN_DB, min_dwell=MIN_DWELL_SECONDS,
+                 min_samples=MIN_CANDIDATE_SAMPLES, alpha=EWMA_ALPHA, percentile=None):
+        self.history = history
+        self.margin = margin
+        self.min_dwell = min_dwell
+        self.min_samples = min_samples
+        self.alpha = alpha
+        self.percentile = percentile
+        self.last_switch_at = None
+        self.last_reason = None
+
+    def smoothed_signal(self, ssid, now):
+        return self.history.smoothed(ssid, now, alpha=self.alpha, percentile=self.percentile)
+
+    def should_switch(self, current_ssid, candidate_ssid, now, score=None):
+        """
+        Returns (switch, reason) for moving from current_ssid to candidate_ssid.
+        score(ssid, now) may replace the smoothed signal as the quantity compared, e.g. a ranking score.
+        """
+        score = score or self.smoothed_signal
+        if candidate_ssid == current_ssid:
+            return self._decide(False, 'already_connected', "already connected")
+        candidate_score = score(candidate_ssid, now)
+        if candidate_score is None:
+            return self._decide(False, 'no_readings', f"no recent readings for {candidate_ssid}")
+        current_score = score(current_ssid, now) if current_ssid else None
+        if current_score is None:
+            return self._decide(True, 'not_connected', "not connected to a visible network")
+        if self.last_switch_at is not None and now - self.last_switch_at < self.min_dwell:
+            return self._decide(False, 'dwell', f"dwell time not reached ({now - self.last_switch_at:.0f}s "
+                                                f"< {self.min_dwell:.0f}s)")
+        if self.history.sample_count(candidate_ssid) < self.min_samples:
+            return self._decide(False, 'few_samples', f"waiting for more readings of {candidate_ssid}")
+        if candidate_score <= current_score + self.margin:
+            return self._decide(False, 'below_margin', f"{candidate_ssid} ({candidate_score:.0f}) is not "
+                                                       f"{self.margin} dB better than {current_ssid} ({current_score:.0f})")
+        return self._decide(True, 'better_signal', f"{candidate_ssid} scores "
+                                                   f"{candidate_score - current_score:.0f} dB better (smoothed)")
+
+    def _decide(self, switch, code, reason):
+        """Returns (switch, reason), keeping a short fixed code for the reason in last_reason for metrics."""
+        self.last_reason = code
+        return switch, reason
+
+    def record_switch(self, now):
+        self.last_switch_at = now
+
+
+PRIORITY_WEIGHT_DB = 3.0      # dB of signal one priority step is worth
+PRIORITY_CAP = 10             # priorities beyond this (e.g. the default 99) all count as lowest
+SUCCESS_WEIGHT_DB = 10.0      # dB bonus for a network that always connects vs. one that never does
+MIN_USABLE_SIGNAL_DBM = -85   # networks weaker than this are never candidates
+DEFAULT_PRIORITY = 99
+
+
+class NetworkRanker:
+    """
+    Ranks visible known networks by a combined score of configured priority,
+    smoothed signal and past connect success. Scores are in dB-equivalents so they
+    can be compared with the switch policy's margin. The known-SSID index is
+    rebuilt only when the configuration version changes.
+    """
+
+    def __init__(self, policy, priority_weight=PRIORITY_WEIGHT_DB, success_weight=SUCCESS_WEIGHT_DB,
+                 min_signal=MIN_USABLE_SIGNAL_DBM):
+        self.policy = policy
+        self.priority_weight = priority_weight
+        self.success_weight = success_weight
+        self.min_signal = min_signal
+        self._priorities = {}
+        self._index_version = None
+        self._attempts = {}  # ssid -> [successes, attempts]
+
+    def update_known_networks(self, known_networks, version):
+        """Rebuilds the SSID -> priority index if the configuration changed since the last call."""
+        if version == self._index_version:
+            return
+        priorities = {}
+        for ssid, details in known_networks.items():
+            priority = details.get('priority')
+            try:
+                priorities[ssid] = int(priority) if priority is not None else DEFAULT_PRIORITY
+            except (TypeError, ValueError):
+                priorities[ssid] = DEFAULT_PRIORITY
+        self._priorities = priorities
+        self._index_version = version
+
+    def record_attempt(self, ssid, success):
+        stats = self._attempts.setdefault(ssid, [0, 0])
+        stats[0] += int(bool(success))
+        stats[1] += 1
+
+    def success_rate(self, ssid):
+        """Laplace-smoothed connect success rate, 0.5 for networks never tried."""
+        successes, attempts = self._attempts.get(ssid, (0, 0))
+        return (successes + 1) / (attempts + 2)
+
+    def score(self, ssid, now):
+        """Returns the combined score for any SSID with recent readings, or None."""
+        signal = self.policy.smoothed_signal(ssid, now)
+        if signal is None:
+            return None
+        priority = min(self._priorities.get(ssid, DEFAULT_PRIORITY), PRIORITY_CAP)
+        return signal - self.priority_weight * priority + self.success_weight * self.success_rate(ssid)
+
+    def rank(self, available_networks, now):
+        """Returns [(ssid, score), ...] for visible, usable known networks, best first."""
+        ranked = []
+        for ssid in available_networks:
+            if ssid not in self._priorities:
+                continue
+            signal = self.policy.smoothed_signal(ssid, now)
+            if signal is None or signal < self.min_signal:
+                continue
+            ranked.append((ssid, self.score(ssid, now)))
+        ranked.sort(key=lambda item: item[1], reverse=True)
+        return ranked
@@ -0,0 +1,51 @@
+import hashlib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def _credential_fingerprint(password):
+    return hashlib.sha256((password or '').encode('utf-8')).hexdigest()
+
+
+class ProfileRegistry:
+    """
+    Remembers which SSIDs already have an OS profile installed, and with which password,
+    so reconnects can activate the existing profile instead of re-adding it every time.
+    Profiles found on the system at startup are trusted until an activation fails.
+    """
+
+    _UNKNOWN = object()  # installed outside this app; credentials unknown
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._installed = None
+        self._lock = threading.Lock()
+
+    def _ensure_seeded(self):
+        if self._installed is None:
+            try:
+                self._installed = {ssid: self._UNKNOWN for ssid in self.backend.installed_profiles()}
+            except Exception as e:
+                logger.warning(f"⚠️ Could not list installed profiles: {e}")
+                self._installed = {}
+
+    def has_profile(self, ssid, password):
+        """True if an installed profile for ssid can be reused with this password."""
+        with self._lock:
+            self._ensure_seeded()
+            fingerprint = self._installed.get(ssid)
+            if fingerprint is None:
+                return False
+            return fingerprint is self._UNKNOWN or fingerprint == _credential_fingerprint(password)
+
+    def mark_installed(self, ssid, password):
+        with self._lock:
+            self._ensure_seeded()
+            self._installed[ssid] = _credential_fingerprint(password)
+
+    def forget(self, ssid):
+        with self._lock:
+            self._ensure_seeded()
+            self._installed.pop(ssid, None)
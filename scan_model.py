@@ -0,0 +1,140 @@
+from array import array
+from collections import namedtuple
+
+BAND_2_4GHZ = '2.4GHz'
+BAND_5GHZ = '5GHz'
+BAND_6GHZ = '6GHz'
+
+# pywifi reports AKM suites as small integers (pywifi.const.AKM_TYPE_*).
+_PYWIFI_AKM_NAMES = {0: 'OPEN', 1: 'WPA', 2: 'WPA-PSK', 3: 'WPA2', 4: 'WPA2-PSK', 5: 'UNKNOWN'}
+
+SSIDSummary = namedtuple('SSIDSummary', ['ssid', 'max_signal', 'mean_signal', 'ap_count', 'bands', 'best_bssid'])
+
+
+def normalize_freq_mhz(freq):
+    """Returns the frequency in MHz; the Windows WLAN API reports kHz."""
+    freq = int(freq or 0)
+    return freq // 1000 if freq > 100000 else freq
+
+
+def band_for(freq_mhz):
+    if not freq_mhz:
+        return None
+    if freq_mhz < 3000:
+        return BAND_2_4GHZ
+    if freq_mhz < 5925:
+        return BAND_5GHZ
+    return BAND_6GHZ
+
+
+def security_label(akm):
+    """Turns a backend's AKM list (pywifi ints or nmcli strings) into one short label."""
+    names = [_PYWIFI_AKM_NAMES.get(item, str(item)) if isinstance(item, int) else str(item) for item in akm or ()]
+    return ' '.join(names) or 'OPEN'
+
+
+class BSSRecord:
+    """One access point (BSSID) from a scan."""
+    __slots__ = ('ssid', 'bssid', 'signal', 'freq', 'security')
+
+    def __init__(self, ssid, bssid, signal, freq, security):
+        self.ssid = ssid
+        self.bssid = bssid
+        self.signal = signal
+        self.freq = freq
+        self.security = security
+
+    @property
+    def band(self):
+        return band_for(self.freq)
+
+    def __repr__(self):
+        return f"BSSRecord({self.ssid!r}, {self.bssid!r}, {self.signal} dBm, {self.freq} MHz)"
+
+
+class ScanTable:
+    """
+    Scan results stored column-wise, one row per BSSID, with an SSID -> rows index.
+    Signals and frequencies live in compact typed arrays; records are built on demand.
+    """
+    __slots__ = ('ssids', 'bssids', 'signals', 'freqs', 'security', '_rows_by_ssid', '_row_by_bssid')
+
+    def __init__(self):
+        self.ssids = []
+        self.bssids = []
+        self.signals = array('h')
+        self.freqs = array('H')
+        self.security = []
+        self._rows_by_ssid = {}
+        self._row_by_bssid = {}
+
+    @classmethod
+    def from_results(cls, results):
+        """Builds a table from backend scan results, skipping hidden SSIDs."""
+        table = cls()
+        for result in results:
+            if result.ssid:
+                table.add(result.ssid, getattr(result, 'bssid', None) or '', result.signal,
+                          normalize_freq_mhz(getattr(result, 'freq', 0)), security_label(getattr(result, 'akm', ())))
+        return table
+
+    def add(self, ssid, bssid, signal, freq, security):
+        """Adds one BSSID; a repeated BSSID keeps its strongest reading."""
+        bssid = bssid.lower()
+        row = self._row_by_bssid.get(bssid) if bssid else None
+        if row is not None:
+            if signal > self.signals[row]:
+                self.signals[row] = int(signal)
+            return
+        row = len(self.ssids)
+        self.ssids.append(ssid)
+        self.bssids.append(bssid)
+        self.signals.append(int(signal))
+        self.freqs.append(int(freq))
+        self.security.append(security)
+        self._rows_by_ssid.setdefault(ssid, []).append(row)
+        if bssid:
+            self._row_by_bssid[bssid] = row
+
+    def __len__(self):
+        return len(self.ssids)
+
+    def record(self, row):
+        return BSSRecord(self.ssids[row], self.bssids[row], self.signals[row], self.freqs[row], self.security[row])
+
+    def records(self, ssid=None):
+        rows = range(len(self.ssids)) if ssid is None else self._rows_by_ssid.get(ssid, ())
+        return [self.record(row) for row in rows]
+
+    def ssid_names(self):
+        return list(self._rows_by_ssid)
+
+    def summary(self, ssid):
+        rows = self._rows_by_ssid.get(ssid)
+        if not rows:
+            return None
+        signals = [self.signals[row] for row in rows]
+        best_row = max(rows, key=lambda row: self.signals[row])
+        bands = tuple(sorted({band_for(self.freqs[row]) for row in rows} - {None}))
+        return SSIDSummary(ssid, max(signals), sum(signals) / len(signals), len(rows), bands, self.bssids[best_row])
+
+    def strongest(self, ssid, band=None):
+        """Returns the strongest BSSRecord for ssid, optionally restricted to one band, or None."""
+        rows = [row for row in self._rows_by_ssid.get(ssid, ()) if band is None or band_for(self.freqs[row]) == band]
+        if not rows:
+            return None
+        return self.record(max(rows, key=lambda row: self.signals[row]))
+
+    def to_networks_dict(self):
+        """The {ssid: {...}} view used by the GUI and switching logic; 'signal' is the strongest AP."""
+        networks = {}
+        for ssid in self._rows_by_ssid:
+            summary = self.summary(ssid)
+            networks[ssid] = {
+                'signal': summary.max_signal,
+                'mean_signal': summary.mean_signal,
+                'ap_count': summary.ap_count,
+                'bands': summary.bands,
+                'bssid': summary.best_bssid,
+            }
+        return networks
@@ -0,0 +1,124 @@
+BASE_SCAN_INTERVAL = 45.0     # seconds between scans on an ordinary link; the old fixed interval
+MIN_SCAN_INTERVAL = 10.0      # floor while the link is weak, falling or down
+MAX_SCAN_INTERVAL = 300.0     # ceiling while the link stays strong and stable
+SCAN_BACKOFF = 2.0            # interval growth per scan on a strong, stable link
+STATUS_POLL_INTERVAL = 5.0    # seconds between passive link status reads while waiting for the next scan
+STRONG_SIGNAL_DBM = -60       # at or above this the link counts as strong
+WEAK_SIGNAL_DBM = -72         # below this the link counts as weak
+SIGNAL_DROP_DB = 8            # a smoothed fall this large since the last scan triggers a scan straight away
+LEVEL_ALPHA = 0.2             # EWMA weight of each reading in the smoothed link level
+
+
+class AdaptiveScanSchedule:
+    """
+    Decides when the next active scan is due. Scans back off geometrically while the
+    current link is strong and not trending down, return to the base interval on an
+    ordinary link, and tighten to the minimum when it is weak, falling or gone.
+    Between scans, observe() feeds in cheap passive status readings (no scan) and
+    brings the next scan forward as soon as the smoothed link level drops sharply.
+    All times come from the caller, so the same schedule runs on real or simulated clocks.
+    """
+
+    def __init__(self, base_interval=BASE_SCAN_INTERVAL, min_interval=MIN_SCAN_INTERVAL,
+                 max_interval=MAX_SCAN_INTERVAL, backoff=SCAN_BACKOFF, poll_interval=STATUS_POLL_INTERVAL,
+                 strong_dbm=STRONG_SIGNAL_DBM, weak_dbm=WEAK_SIGNAL_DBM, drop_db=SIGNAL_DROP_DB,
+                 alpha=LEVEL_ALPHA):
+        self.base_interval = base_interval
+        self.min_interval = min(min_interval, base_interval)
+        self.max_interval = max(max_interval, base_interval)
+        self.backoff = backoff
+        self.poll_interval = poll_interval
+        self.strong_dbm = strong_dbm
+        self.weak_dbm = weak_dbm
+        self.drop_db = drop_db
+        self.alpha = alpha
+        self.interval = base_interval
+        self.next_scan_at = None  # None: scan now
+        self.started_at = None
+        self.level = None         # smoothed dBm of the current link
+        self.scan_level = None    # level when the last scan was scheduled
+        self.active_scans = 0
+        self.passive_reads = 0
+        self.early_scans = 0
+
+    def due(self, now):
+        return self.next_scan_at is None or now >= self.next_scan_at
+
+    def wait_time(self, now):
+        """Seconds to wait before the next passive read or scan, whichever comes first."""
+        if self.due(now):
+            return 0.0
+        return min(self.poll_interval, self.next_scan_at - now)
+
+    def _update_level(self, signal_dbm):
+        if signal_dbm is None:
+            self.level = None
+        elif self.level is None:
+            self.level = float(signal_dbm)
+        else:
+            self.level += self.alpha * (signal_dbm - self.level)
+
+    def trend(self):
+        """dB the smoothed link level has moved since the last scan (negative when falling), or None."""
+        if self.level is None or self.scan_level is None:
+            return None
+        return self.level - self.scan_level
+
+    def record_scan(self, now, signal_dbm, link_changed=False):
+        """
+        Schedules the next scan after an active scan. signal_dbm is the current link's
+        signal (None when disconnected); link_changed is True after a switch.
+        """
+        if self.started_at is None:
+            self.started_at = now
+        self.active_scans += 1
+        if link_changed:
+            self.level = None
+            self.interval = self.base_interval
+        else:
+            self._update_level(signal_dbm)
+            trend = self.trend()
+            if self.level is None or self.level < self.weak_dbm or (trend is not None and trend <= -self.drop_db / 2):
+                self.interval = self.min_interval
+            elif self.level >= self.strong_dbm:
+                self.interval = min(max(self.interval, self.base_interval) * self.backoff, self.max_interval)
+            else:
+                self.interval = self.base_interval
+        self.scan_level = self.level
+        self.next_scan_at = now + self.interval
+        return self.interval
+
+    def observe(self, now, signal_dbm):
+        """
+        Feeds a passive status reading taken between scans. Returns True if it brought
+        the next scan forward (the link went down, turned weak or fell by drop_db).
+        """
+        self.passive_reads += 1
+        was_connected = self.level is not None
+        self._update_level(signal_dbm)
+        if self.due(now):
+            return False
+        if self.level is None:
+            dropped = was_connected and self.scan_level is not None
+        else:
+            dropped = ((self.level < self.weak_dbm and self.interval > self.min_interval) or
+                       (self.scan_level is not None and self.scan_level - self.level >= self.drop_db))
+        if not dropped:
+            return False
+        self.early_scans += 1
+        self.interval = self.min_interval
+        self.next_scan_at = now
+        return True
+
+    def stats(self, now):
+        """Scan counts so far, including how many scans a fixed base_interval schedule would have run."""
+        elapsed = now - self.started_at if self.started_at is not None else 0.0
+        fixed_scans = int(elapsed // self.base_interval) + 1 if self.started_at is not None else 0
+        return {
+            'active_scans': self.active_scans,
+            'passive_reads': self.passive_reads,
+            'early_scans': self.early_scans,
+            'fixed_interval_scans': fixed_scans,
+            'scans_saved': fixed_scans - self.active_scans,
+            'current_interval': self.interval,
+        }
@@ -0,0 +1,123 @@
+import json
+import threading
+import time
+
+from backends import Backend
+from simulation import FakeProfile, RFEnvironment
+
+TRACE_VERSION = 1
+
+
+class RecordingBackend(Backend):
+    """
+    Wraps a backend and appends what scan_results() and current_connection() return
+    to a JSON-lines trace, one line per change; everything else passes straight through.
+    Lines look like {"t": seconds_since_start, "kind": "scan", "aps": [[ssid, bssid, dBm, MHz], ...]}
+    or {"t": ..., "kind": "status", "ssid": ..., "signal": percent}.
+    """
+
+    def __init__(self, backend, path):
+        self.backend = backend
+        self.name = backend.name
+        self.clock = backend.clock
+        self.path = path
+        self._lock = threading.Lock()
+        self._last = {}
+        self._started_at = self.clock.monotonic()
+        self._file = open(path, 'w', encoding='utf-8')
+        self._write({'kind': 'header', 'version': TRACE_VERSION, 'backend': backend.name,
+                     'interface': backend.interface_name(), 'started': time.time()})
+
+    def _write(self, record):
+        self._file.write(json.dumps(record) + '\n')
+        self._file.flush()
+
+    def _record(self, kind, **fields):
+        with self._lock:
+            if self._file.closed or self._last.get(kind) == fields:
+                return
+            self._last[kind] = fields
+            self._write({'t': round(self.clock.monotonic() - self._started_at, 3), 'kind': kind, **fields})
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def scan_results(self):
+        results = self.backend.scan_results()
+        self._record('scan', aps=[[p.ssid, getattr(p, 'bssid', None) or '', p.signal, getattr(p, 'freq', 0)]
+                                  for p in results])
+        return results
+
+    def current_connection(self):
+        ssid, signal = self.backend.current_connection()
+        self._record('status', ssid=ssid, signal=signal)
+        return ssid, signal
+
+    def interface_name(self):
+        return self.backend.interface_name()
+
+    def scan(self):
+        return self.backend.scan()
+
+    def status(self):
+        return self.backend.status()
+
+    def connect(self, ssid, password, bssid=None):
+        return self.backend.connect(ssid, password, bssid)
+
+    def connect_enterprise(self, ssid, username, password, bssid=None):
+        return self.backend.connect_enterprise(ssid, username, password, bssid)
+
+    def installed_profiles(self):
+        return self.backend.installed_profiles()
+
+    def activate_profile(self, ssid, bssid=None):
+        return self.backend.activate_profile(ssid, bssid)
+
+    def disconnect(self):
+        return self.backend.disconnect()
+
+    def watch(self, callback):
+        return self.backend.watch(callback)
+
+
+class Trace:
+    """A recorded trace: timed scans and connection changes, replayable as an RFEnvironment."""
+
+    def __init__(self, header, scans, statuses):
+        self.header = header
+        self.scans = scans        # [(t, [[ssid, bssid, dBm, MHz], ...]), ...]
+        self.statuses = statuses  # [(t, ssid, signal_percent), ...]
+
+    @classmethod
+    def load(cls, path):
+        header, scans, statuses = {}, [], []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if record['kind'] == 'header':
+                    if record.get('version') != TRACE_VERSION:
+                        raise ValueError(f"{path}: unsupported trace version {record.get('version')}")
+                    header = record
+                elif record['kind'] == 'scan':
+                    scans.append((record['t'], record['aps']))
+                elif record['kind'] == 'status':
+                    statuses.append((record['t'], record['ssid'], record['signal']))
+        return cls(header, scans, statuses)
+
+    @property
+    def duration(self):
+        times = [t for t, _ in self.scans] + [t for t, _, _ in self.statuses]
+        return max(times) if times else 0.0
+
+    def connected_ssids(self):
+        """SSIDs the recorded machine was connected to, in order of first appearance."""
+        return list(dict.fromkeys(ssid for _, ssid, _ in self.statuses if ssid))
+
+    def environment(self):
+        """An RFEnvironment that reproduces the recorded scans; every AP accepts any password."""
+        return RFEnvironment([(t, [FakeProfile(ssid, bssid, signal, freq) for ssid, bssid, signal, freq in aps])
+                              for t, aps in self.scans])
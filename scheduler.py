@@ -0,0 +1,74 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_WORKERS = 3  # one scan, one connect and one spare for short jobs
+
+
+class TaskScheduler:
+    """
+    A small fixed thread pool that coalesces and cancels operations by key.
+
+    submit(key, fn) joins the task already in flight under the same key, so repeated
+    scan requests share one scan. submit_latest(key, fn) signals the in-flight task's
+    cancel event and starts a new one; fn must accept a cancel_event keyword and stop
+    at its next checkpoint once the event is set.
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='wifi-worker')
+        self._in_flight = {}  # key -> (future, cancel_event)
+        self._lock = threading.RLock()  # cancelling a queued future runs untrack() re-entrantly
+
+    def _track(self, key, future, cancel_event):
+        self._in_flight[key] = (future, cancel_event)
+
+        def untrack(done):
+            with self._lock:
+                if self._in_flight.get(key, (None,))[0] is done:
+                    del self._in_flight[key]
+
+        future.add_done_callback(untrack)
+
+    def submit(self, key, fn, *args, **kwargs):
+        """Runs fn(*args, **kwargs) unless a task with this key is in flight; returns that task's future."""
+        with self._lock:
+            entry = self._in_flight.get(key)
+            if entry is not None:
+                return entry[0]
+            future = self._executor.submit(fn, *args, **kwargs)
+            self._track(key, future, None)
+            return future
+
+    def submit_latest(self, key, fn, *args, **kwargs):
+        """Cancels the in-flight task with this key, then runs fn(*args, cancel_event=..., **kwargs)."""
+        cancel_event = threading.Event()
+        with self._lock:
+            entry = self._in_flight.get(key)
+            if entry is not None:
+                self._cancel_entry(entry)
+            future = self._executor.submit(fn, *args, cancel_event=cancel_event, **kwargs)
+            self._track(key, future, cancel_event)
+            return future
+
+    @staticmethod
+    def _cancel_entry(entry):
+        future, cancel_event = entry
+        future.cancel()  # only succeeds while still queued
+        if cancel_event is not None:
+            cancel_event.set()
+
+    def cancel(self, key):
+        with self._lock:
+            entry = self._in_flight.get(key)
+            if entry is not None:
+                self._cancel_entry(entry)
+
+    def in_flight(self, key):
+        with self._lock:
+            return key in self._in_flight
+
+    def shutdown(self):
+        with self._lock:
+            for entry in self._in_flight.values():
+                self._cancel_entry(entry)
+        self._executor.shutdown(wait=False)
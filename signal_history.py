@@ -0,0 +1,108 @@
+import threading
+from array import array
+from collections import OrderedDict
+
+SIGNAL_HISTORY_SIZE = 16      # samples kept per SSID
+MAX_TRACKED_SSIDS = 128       # least recently seen SSIDs are evicted beyond this
+SAMPLE_MAX_AGE = 180.0        # seconds before an SSID's history no longer counts as current
+
+
+class SignalRing:
+    """Fixed-capacity ring buffer of (timestamp, dBm) samples stored in two flat arrays."""
+    __slots__ = ('_times', '_values', '_next', '_size')
+
+    def __init__(self, capacity=SIGNAL_HISTORY_SIZE):
+        self._times = array('d', bytes(8 * capacity))
+        self._values = array('d', bytes(8 * capacity))
+        self._next = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def capacity(self):
+        return len(self._values)
+
+    def append(self, timestamp, dbm):
+        self._times[self._next] = timestamp
+        self._values[self._next] = dbm
+        self._next = (self._next + 1) % len(self._values)
+        self._size = min(self._size + 1, len(self._values))
+
+    def _indices(self):
+        """Yields buffer positions from the oldest sample to the newest."""
+        start = (self._next - self._size) % len(self._values)
+        for offset in range(self._size):
+            yield (start + offset) % len(self._values)
+
+    def samples(self):
+        return [(self._times[i], self._values[i]) for i in self._indices()]
+
+    def latest(self):
+        """Returns the newest (timestamp, dBm) sample, or None if empty."""
+        if not self._size:
+            return None
+        i = (self._next - 1) % len(self._values)
+        return self._times[i], self._values[i]
+
+    def ewma(self, alpha):
+        """Exponentially weighted moving average; alpha is the weight of each new sample."""
+        average = None
+        for i in self._indices():
+            value = self._values[i]
+            average = value if average is None else alpha * value + (1 - alpha) * average
+        return average
+
+    def percentile(self, fraction):
+        """Returns the sample at the given fraction (0-1) of the sorted values, or None if empty."""
+        if not self._size:
+            return None
+        values = sorted(self._values[i] for i in self._indices())
+        return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+class SignalHistory:
+    """
+    Per-SSID signal rings. Memory stays constant however long the app runs:
+    each ring has a fixed size and at most max_ssids rings are kept.
+    """
+
+    def __init__(self, capacity=SIGNAL_HISTORY_SIZE, max_ssids=MAX_TRACKED_SSIDS):
+        self.capacity = capacity
+        self.max_ssids = max_ssids
+        self._rings = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, ssid, dbm, timestamp):
+        with self._lock:
+            ring = self._rings.get(ssid)
+            if ring is None:
+                ring = self._rings[ssid] = SignalRing(self.capacity)
+                if len(self._rings) > self.max_ssids:
+                    self._rings.popitem(last=False)
+            else:
+                self._rings.move_to_end(ssid)
+            ring.append(timestamp, dbm)
+
+    def record_scan(self, networks, timestamp):
+        """Records every {ssid: {'signal': dbm}} entry of a scan."""
+        for ssid, details in networks.items():
+            if details.get('signal') is not None:
+                self.record(ssid, details['signal'], timestamp)
+
+    def smoothed(self, ssid, now, alpha=0.4, percentile=None, max_age=SAMPLE_MAX_AGE):
+        """
+        Returns the smoothed signal for ssid (EWMA, or the given percentile if set),
+        or None if it has no samples or was last seen more than max_age seconds ago.
+        """
+        with self._lock:
+            ring = self._rings.get(ssid)
+            if ring is None or now - ring.latest()[0] > max_age:
+                return None
+            return ring.ewma(alpha) if percentile is None else ring.percentile(percentile)
+
+    def sample_count(self, ssid):
+        with self._lock:
+            ring = self._rings.get(ssid)
+            return len(ring) if ring is not None else 0
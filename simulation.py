@@ -0,0 +1,233 @@
+import bisect
+import time
+
+from backends import (Backend, STATUS_CONNECTED, STATUS_CONNECTING, STATUS_DISCONNECTED,
+                      dbm_to_percent)
+
+# Mirrors pywifi.const so fakes behave like real interfaces without importing pywifi.
+IFACE_DISCONNECTED = 0
+IFACE_SCANNING = 1
+IFACE_INACTIVE = 2
+IFACE_CONNECTING = 3
+IFACE_CONNECTED = 4
+AUTH_ALG_OPEN = 0
+AKM_TYPE_NONE = 0
+AKM_TYPE_WPA2PSK = 4
+CIPHER_TYPE_NONE = 0
+CIPHER_TYPE_CCMP = 3
+
+
+class FakeProfile:
+    """A scan result / network profile shaped like pywifi.Profile."""
+
+    def __init__(self, ssid='', bssid='', signal=-100, freq=2412, akm=None, key=None):
+        self.auth = AUTH_ALG_OPEN
+        self.cipher = CIPHER_TYPE_NONE
+        self.ssid = ssid
+        self.bssid = bssid
+        self.signal = signal
+        self.freq = freq
+        self.akm = list(akm or [])
+        self.key = key
+
+    def copy(self):
+        return FakeProfile(self.ssid, self.bssid, self.signal, self.freq, self.akm, self.key)
+
+
+class FakeInterface:
+    """
+    In-memory stand-in for a pywifi interface.
+    scan() completes after scan_duration seconds; until then scan_results() keeps
+    returning the previous (cached) results, just like the Windows WLAN API does.
+    """
+
+    def __init__(self, access_points=(), scan_duration=0.4, connect_duration=0.5, name='fake0'):
+        self._name = name
+        self.access_points = [ap.copy() for ap in access_points]
+        self.scan_duration = scan_duration
+        self.connect_duration = connect_duration
+        self.scan_count = 0
+        self._scan_started = None
+        self._cached_results = []
+        self._profiles = []
+        self._target_ssid = None
+        self._connect_started = None
+
+    def name(self):
+        return self._name
+
+    def set_access_points(self, access_points):
+        """Replaces what the next scan will see."""
+        self.access_points = [ap.copy() for ap in access_points]
+
+    def scan(self):
+        self.scan_count += 1
+        self._scan_started = time.monotonic()
+
+    def scan_results(self):
+        if self._scan_started is not None and time.monotonic() - self._scan_started >= self.scan_duration:
+            self._cached_results = [ap.copy() for ap in self.access_points]
+            self._scan_started = None
+        return list(self._cached_results)
+
+    def add_network_profile(self, profile):
+        self._profiles = [p for p in self._profiles if p.ssid != profile.ssid]
+        self._profiles.append(profile)
+        return profile
+
+    def network_profiles(self):
+        return list(self._profiles)
+
+    def remove_all_network_profiles(self):
+        self._profiles = []
+
+    def connect(self, profile):
+        self._target_ssid = profile.ssid
+        self._connect_started = time.monotonic()
+
+    def disconnect(self):
+        self._target_ssid = None
+        self._connect_started = None
+
+    def status(self):
+        if self._target_ssid is None:
+            return IFACE_DISCONNECTED
+        if not any(ap.ssid == self._target_ssid for ap in self.access_points):
+            return IFACE_DISCONNECTED
+        if time.monotonic() - self._connect_started < self.connect_duration:
+            return IFACE_CONNECTING
+        return IFACE_CONNECTED
+
+
+class SimClock:
+    """Virtual clock: sleep() advances time instantly, so simulations run as fast as the CPU allows."""
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += max(0.0, seconds)
+
+
+class RFEnvironment:
+    """
+    A scripted radio environment: a list of (start_time, access_points) steps.
+    Each step describes everything in range from start_time until the next step begins.
+    access_points are FakeProfile objects; a non-None key is the password the AP accepts.
+    """
+
+    def __init__(self, steps):
+        steps = sorted(steps, key=lambda step: step[0])
+        self._times = [start for start, _ in steps]
+        self._steps = [list(access_points) for _, access_points in steps]
+
+    @classmethod
+    def static(cls, access_points):
+        return cls([(0.0, access_points)])
+
+    def access_points(self, at):
+        index = bisect.bisect_right(self._times, at) - 1
+        return self._steps[index] if index >= 0 else []
+
+    def strongest(self, ssid, at):
+        """Returns the strongest AP broadcasting ssid at the given time, or None."""
+        matches = [ap for ap in self.access_points(at) if ap.ssid == ssid]
+        return max(matches, key=lambda ap: ap.signal) if matches else None
+
+    def find(self, ssid, bssid, at):
+        """Returns the AP with this BSSID (or the strongest for ssid if bssid is None), or None."""
+        if bssid is None:
+            return self.strongest(ssid, at)
+        for ap in self.access_points(at):
+            if ap.ssid == ssid and ap.bssid.lower() == bssid.lower():
+                return ap
+        return None
+
+
+class SimulatedBackend(Backend):
+    """
+    In-memory backend driven by an RFEnvironment and a virtual clock.
+    Scans and associations take simulated time only, so switching logic can be
+    exercised at thousands of cycles per second on machines without a radio.
+    """
+    name = 'simulated'
+
+    def __init__(self, environment, clock=None, scan_duration=0.5, connect_duration=1.0, interface='sim0'):
+        self.environment = environment
+        self.clock = clock or SimClock()
+        self.scan_duration = scan_duration
+        self.connect_duration = connect_duration
+        self.interface = interface
+        self.scan_count = 0
+        self.connect_count = 0
+        self.profiles = {}  # ssid -> password of installed profiles
+        self._scan_started = None
+        self._cached_results = []
+        self._target = None  # (ssid, password, started_at, bssid)
+
+    def interface_name(self):
+        return self.interface
+
+    def scan(self):
+        self.scan_count += 1
+        self._scan_started = self.clock.monotonic()
+
+    def scan_results(self):
+        if self._scan_started is not None:
+            finished_at = self._scan_started + self.scan_duration
+            if self.clock.monotonic() >= finished_at:
+                self._cached_results = [ap.copy() for ap in self.environment.access_points(finished_at)]
+                self._scan_started = None
+        return list(self._cached_results)
+
+    def _associated_ap(self):
+        if self._target is None:
+            return None
+        ssid, password, _, bssid = self._target
+        ap = self.environment.find(ssid, bssid, self.clock.monotonic())
+        if ap is None or (ap.key is not None and password is not None and ap.key != password):
+            return None
+        return ap
+
+    def status(self):
+        if self._target is None:
+            return STATUS_DISCONNECTED
+        ssid, _, started_at, bssid = self._target
+        if self.clock.monotonic() - started_at < self.connect_duration:
+            in_range = self.environment.find(ssid, bssid, self.clock.monotonic()) is not None
+            return STATUS_CONNECTING if in_range else STATUS_DISCONNECTED
+        return STATUS_CONNECTED if self._associated_ap() is not None else STATUS_DISCONNECTED
+
+    def current_connection(self):
+        if self.status() != STATUS_CONNECTED:
+            return None, None
+        ap = self._associated_ap()
+        return ap.ssid, dbm_to_percent(ap.signal)
+
+    def connect(self, ssid, password, bssid=None):
+        self.profiles[ssid] = password
+        return self.activate_profile(ssid, bssid)
+
+    def installed_profiles(self):
+        return set(self.profiles)
+
+    def activate_profile(self, ssid, bssid=None):
+        if ssid not in self.profiles:
+            return False
+        self.connect_count += 1
+        self._target = (ssid, self.profiles[ssid], self.clock.monotonic(), bssid)
+        return True
+
+    def connect_enterprise(self, ssid, username, password, bssid=None):
+        # Enterprise credentials live in the OS profile; the simulation accepts any.
+        self.profiles.setdefault(ssid, None)
+        return self.activate_profile(ssid, bssid)
+
+    def disconnect(self):
+        self._target = None
@@ -0,0 +1,100 @@
+import logging
+import threading
+from collections import namedtuple
+
+STATUS_TTL = 2.0                 # seconds a snapshot is served before callers trigger a refresh
+STATUS_REFRESH_INTERVAL = 5.0    # background refresh period when the backend has no change events
+WATCHED_REFRESH_INTERVAL = 60.0  # with change events, periodic refreshes only keep the signal reading current
+
+StatusSnapshot = namedtuple('StatusSnapshot', ['ssid', 'signal', 'taken_at'])
+
+logger = logging.getLogger(__name__)
+
+
+class StatusMonitor:
+    """
+    Caches the backend's current connection so every caller shares one snapshot.
+    get() serves the cached snapshot while it is younger than the TTL; concurrent
+    callers that find it stale wait on a single refresh instead of each querying the OS.
+    start() runs one long-lived thread that keeps the snapshot fresh, woken early by
+    backend change events where the backend provides them. While events are flowing,
+    the periodic refresh slows to watched_refresh_interval, since connection changes
+    arrive as events and only the signal reading can drift unnoticed.
+    """
+
+    def __init__(self, backend, ttl=STATUS_TTL, refresh_interval=STATUS_REFRESH_INTERVAL,
+                 watched_refresh_interval=WATCHED_REFRESH_INTERVAL):
+        self.backend = backend
+        self.clock = backend.clock
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self.watched_refresh_interval = watched_refresh_interval
+        self.refresh_count = 0
+        self._snapshot = StatusSnapshot(None, None, float('-inf'))
+        self._refresh_lock = threading.Lock()
+        self._listeners = []
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._unwatch = None
+
+    def snapshot(self):
+        """Returns the cached snapshot without touching the OS (it may be stale)."""
+        return self._snapshot
+
+    def get(self, max_age=None):
+        """Returns a snapshot no older than max_age (defaults to the TTL), refreshing if needed."""
+        max_age = self.ttl if max_age is None else max_age
+        snapshot = self._snapshot
+        if self.clock.monotonic() - snapshot.taken_at <= max_age:
+            return snapshot
+        return self.refresh(if_older_than=max_age)
+
+    def refresh(self, if_older_than=None):
+        """Queries the backend and publishes a new snapshot."""
+        with self._refresh_lock:
+            previous = self._snapshot
+            if if_older_than is not None and self.clock.monotonic() - previous.taken_at <= if_older_than:
+                return previous  # Another caller refreshed while we waited for the lock.
+            ssid, signal = self.backend.current_connection()
+            snapshot = StatusSnapshot(ssid, signal, self.clock.monotonic())
+            self._snapshot = snapshot
+            self.refresh_count += 1
+        if (snapshot.ssid, snapshot.signal) != (previous.ssid, previous.signal):
+            for callback in list(self._listeners):
+                callback(snapshot)
+        return snapshot
+
+    def invalidate(self):
+        """Marks the snapshot stale, e.g. after a connect, and wakes the background thread."""
+        self._snapshot = self._snapshot._replace(taken_at=float('-inf'))
+        self._wake_event.set()
+
+    def add_listener(self, callback):
+        """Registers callback(snapshot), called from the refreshing thread whenever the SSID or signal changes."""
+        self._listeners.append(callback)
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._unwatch = self.backend.watch(self.invalidate)
+        self._thread = threading.Thread(target=self._run, name='status-monitor', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._unwatch is not None:
+            self._unwatch()
+            self._unwatch = None
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"⚠️ Status refresh failed: {e}")
+            watched = self._unwatch is not None
+            self._wake_event.wait(self.watched_refresh_interval if watched else self.refresh_interval)
+            self._wake_event.clear()
@@ -0,0 +1,348 @@
+import argparse
+import asyncio
+import logging
+import os
+import threading
+
+from backends import create_backends, percent_to_dbm
+from metrics import JsonLinesExporter, serve_prometheus
+from policy import NetworkRanker, SwitchPolicy
+from scan_trace import RecordingBackend
+from scan_model import BAND_2_4GHZ, BAND_5GHZ, BAND_6GHZ
+from scan_schedule import MAX_SCAN_INTERVAL, MIN_SCAN_INTERVAL, STATUS_POLL_INTERVAL, AdaptiveScanSchedule
+from scheduler import TaskScheduler
+from signal_history import SignalHistory
+from wifi_logic import WiFiSwitcher
+
+SCAN_INTERVAL = 45        # base interval; the scan schedule stretches or shortens it with link quality
+SCAN_TIMEOUT = 20.0       # seconds before a scan coroutine is abandoned
+STATUS_TIMEOUT = 10.0
+CONNECT_TIMEOUT = 60.0    # covers a full fall-through over several candidates
+STOP_TIMEOUT = 5.0        # longest stop_thread() or a restart waits for the service thread to exit
+
+logger = logging.getLogger(__name__)
+
+
+class SwitchService:
+    """
+    Headless auto-switch engine. Scan, status and connect run as cancellable
+    coroutines with timeouts; blocking backend calls run on a shared TaskScheduler,
+    so scans coalesce with and connects supersede those started by a frontend.
+    Frontends (the GUI, the CLI) subscribe to events instead of driving the loop.
+
+    Events are delivered as callback(event, data) from the service's thread:
+    'log' {'message'}, 'scan' {'networks'}, 'switch' {'from', 'to', 'reason'},
+    'connected' {'ssid'}, 'connect_failed' {'ssid'}.
+    """
+
+    def __init__(self, wifi_manager, scan_interval=SCAN_INTERVAL, policy=None, scheduler=None, scan_schedule=None):
+        self.wifi_manager = wifi_manager
+        self.scheduler = scheduler or TaskScheduler()
+        self.scan_interval = scan_interval
+        self.scan_schedule = scan_schedule or AdaptiveScanSchedule(base_interval=scan_interval)
+        self.signal_history = SignalHistory()
+        self.switch_policy = policy or SwitchPolicy(self.signal_history)
+        self.ranker = NetworkRanker(self.switch_policy)
+        metrics = wifi_manager.metrics
+        self.decisions = metrics.counter('wifi_switch_decisions_total', "Auto-switch decisions by outcome and reason",
+                                         label_names=('decision', 'reason'))
+        self.cycle_latency = metrics.histogram('wifi_switch_cycle_seconds',
+                                               "Auto-switch cycle time, from status check to connect result")
+        self.cycle_errors = metrics.counter('wifi_switch_cycle_errors_total', "Auto-switch cycles that failed",
+                                            label_names=('error',))
+        self._subscribers = []
+        self._loop = None
+        self._task = None
+        self._thread = None
+        self._stopping = False
+
+    def subscribe(self, callback):
+        self._subscribers.append(callback)
+
+    def emit(self, event, **data):
+        for callback in list(self._subscribers):
+            try:
+                callback(event, data)
+            except Exception as e:
+                logger.warning(f"⚠️ Subscriber failed on '{event}': {e}")
+
+    def log(self, message):
+        self.emit('log', message=message)
+
+    # --- Coroutines ---
+    async def _await_task(self, future, timeout, key=None):
+        """Awaits a scheduler future; shielded so a timeout here never cancels a task others joined."""
+        try:
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            if key is not None:
+                self.scheduler.cancel(key)
+            raise
+
+    async def scan(self):
+        future = self.scheduler.submit('scan', self.wifi_manager.scan_available_networks)
+        networks = await self._await_task(future, SCAN_TIMEOUT)
+        self.emit('scan', networks=networks)
+        return networks
+
+    async def current_connection(self, max_age=None):
+        future = self.scheduler.submit('status', self.wifi_manager.get_current_connection, max_age)
+        return await self._await_task(future, STATUS_TIMEOUT)
+
+    async def connect(self, ssids):
+        """Tries ssids in order; returns the SSID that connected, or None."""
+        future = self.scheduler.submit_latest('connect', self.connect_first, ssids)
+        return await self._await_task(future, CONNECT_TIMEOUT, key='connect')
+
+    # --- Synchronous decision logic, shared with benchmarks ---
+    def decide(self, current_ssid, networks, now):
+        """
+        Records a scan and returns (candidates, reason). candidates is the ordered
+        list of SSIDs to try, or an empty list to stay put.
+        """
+        self.signal_history.record_scan(networks, now)
+        version, known_networks = self.wifi_manager.config_snapshot()
+        self.ranker.update_known_networks(known_networks, version)
+        ranked = self.ranker.rank(networks, now)
+        if not ranked:
+            self.decisions.inc(decision='stay', reason='no_candidates')
+            return [], "no usable known networks in range"
+        best_ssid = ranked[0][0]
+        if current_ssid == best_ssid:
+            self.decisions.inc(decision='stay', reason='already_best')
+            return [], f"already on the best network: {current_ssid}"
+        should_switch, reason = self.switch_policy.should_switch(current_ssid, best_ssid, now,
+                                                                 score=self.ranker.score)
+        self.decisions.inc(decision='switch' if should_switch else 'stay', reason=self.switch_policy.last_reason)
+        if not should_switch:
+            return [], reason
+        self.switch_policy.record_switch(now)
+        # Fall back down the ranking, then to the current network, without rescanning. With a
+        # standby adapter a failed switch never drops the current link, so there is nothing to
+        # fall back to, and "reconnecting" to it would report a failed switch as a successful one.
+        candidates = [ssid for ssid, _ in ranked if ssid != current_ssid]
+        if current_ssid in known_networks and self.wifi_manager.standby_adapter() is None:
+            candidates.append(current_ssid)
+        return candidates, reason
+
+    def connect_first(self, ssids, cancel_event=None):
+        """Blocking: connects to the first of ssids that works and returns it, or None."""
+        for ssid in ssids:
+            if cancel_event is not None and cancel_event.is_set():
+                self.log("Connect superseded by a newer request.")
+                return None
+            self.log(f"Attempting to connect to {ssid}...")
+            success = self.wifi_manager.connect_to_known_network(ssid, cancel_event)
+            if cancel_event is not None and cancel_event.is_set():
+                continue  # the abandoned attempt says nothing about the network
+            self.ranker.record_attempt(ssid, success)
+            if success:
+                self.emit('connected', ssid=ssid)
+                return ssid
+            self.emit('connect_failed', ssid=ssid)
+        return None
+
+    def finish_cycle(self, current_ssid, signal, candidates, reason, connected):
+        """
+        Logs a cycle's outcome and schedules the next scan. signal is the link's reading from
+        the start of the cycle; connected is the SSID the switch reached, or None. Returns connected.
+        """
+        now = self.wifi_manager.clock.monotonic()
+        if not candidates:
+            self.log(f"Staying on {current_ssid}: {reason}" if current_ssid else f"Not switching: {reason}")
+            self.scan_schedule.record_scan(now, _signal_dbm(signal))
+        else:
+            # After a switch the old link's history says nothing; after a failed one there is no link.
+            self.scan_schedule.record_scan(now, None, link_changed=connected is not None)
+        return connected
+
+    def observe_link(self, signal):
+        """Feeds a passive status reading taken between scans; returns True if it brought the next scan forward."""
+        if not self.scan_schedule.observe(self.wifi_manager.clock.monotonic(), _signal_dbm(signal)):
+            return False
+        self.log("📉 Link signal dropped; scanning early.")
+        return True
+
+    async def run_cycle(self):
+        clock = self.wifi_manager.clock
+        start = clock.monotonic()
+        try:
+            return await self._run_cycle()
+        finally:
+            self.cycle_latency.observe(clock.monotonic() - start)
+
+    async def _run_cycle(self):
+        clock = self.wifi_manager.clock
+        current_ssid, signal = await self.current_connection()
+        networks = await self.scan()
+        candidates, reason = self.decide(current_ssid, networks, clock.monotonic())
+        connected = None
+        if candidates:
+            self.emit('switch', **{'from': current_ssid, 'to': candidates[0], 'reason': reason})
+            connected = await self.connect(candidates)
+        return self.finish_cycle(current_ssid, signal, candidates, reason, connected)
+
+    async def _wait_for_next_scan(self):
+        """Sleeps until the scan schedule says a scan is due, reading link status passively meanwhile."""
+        clock = self.wifi_manager.clock
+        while not self.scan_schedule.due(clock.monotonic()):
+            await asyncio.sleep(self.scan_schedule.wait_time(clock.monotonic()))
+            if self.scan_schedule.due(clock.monotonic()):
+                return
+            try:
+                # A reading as old as the poll period will do; the status monitor keeps one that fresh,
+                # so passive reads rarely start an OS query of their own.
+                _, signal = await self.current_connection(max_age=self.scan_schedule.poll_interval)
+            except asyncio.TimeoutError:
+                continue
+            self.observe_link(signal)
+
+    def scan_stats(self):
+        return self.scan_schedule.stats(self.wifi_manager.clock.monotonic())
+
+    async def run(self):
+        """Runs switch cycles until cancelled, spaced by the adaptive scan schedule."""
+        clock = self.wifi_manager.clock
+        while True:
+            try:
+                self.log("⚙️ Auto-scan running...")
+                await self.run_cycle()
+            except asyncio.TimeoutError:
+                self.cycle_errors.inc(error='timeout')
+                self.log("Auto-switch cycle timed out.")
+                self.scan_schedule.record_scan(clock.monotonic(), None)
+            except Exception as e:
+                self.cycle_errors.inc(error=type(e).__name__)
+                self.log(f"Error in auto-switch loop: {e}")
+                self.scan_schedule.record_scan(clock.monotonic(), None)
+            self.log(f"Next scan in {self.scan_schedule.interval:.0f}s.")
+            await self._wait_for_next_scan()
+
+    # --- Running alongside a GUI ---
+    def start_in_thread(self):
+        """Runs the service on its own event loop in a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            if not self._stopping:
+                return
+            self._thread.join(STOP_TIMEOUT)  # a stop is still unwinding; let it finish first
+            if self._thread.is_alive():
+                logger.warning("⚠️ The previous switch-service thread is still stopping; not starting another.")
+                return
+        self._stopping = False
+        started = threading.Event()
+
+        def runner():
+            self._loop = asyncio.new_event_loop()
+            self._task = self._loop.create_task(self.run())
+            started.set()
+            try:
+                self._loop.run_until_complete(self._task)
+            except asyncio.CancelledError:
+                pass
+            finally:
+                self._loop.close()
+
+        self._thread = threading.Thread(target=runner, name='switch-service', daemon=True)
+        self._thread.start()
+        started.wait()
+
+    def stop_thread(self, timeout=STOP_TIMEOUT):
+        """
+        Cancels the service started by start_in_thread and waits up to timeout seconds for
+        its thread to exit (from the service thread itself it only cancels). Returns True
+        once the thread has exited; a later start_in_thread() waits for a slow one.
+        """
+        self._stopping = True
+        if self._loop is not None and self._task is not None and not self._loop.is_closed():
+            try:
+                self._loop.call_soon_threadsafe(self._task.cancel)
+            except RuntimeError:
+                pass  # the loop closed meanwhile; the service already stopped
+        if self._thread is None:
+            return True
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+
+def _signal_dbm(percent):
+    return percent_to_dbm(percent) if percent is not None else None
+
+
+def _log_event(event, data):
+    if event == 'log':
+        logger.info(data['message'])
+    elif event == 'switch':
+        logger.info(f"Switching {data['from']} -> {data['to']}: {data['reason']}")
+    elif event in ('connected', 'connect_failed'):
+        outcome = "Connected to" if event == 'connected' else "Failed to connect to"
+        logger.info(f"{outcome} {data['ssid']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Smart Wi-Fi Switcher daemon.")
+    parser.add_argument('--config', default='networks.json', help="known networks file")
+    parser.add_argument('--backend', default='auto', choices=['auto', 'pywifi', 'nmcli', 'simulated'])
+    parser.add_argument('--interface', action='append', default=None,
+                        help="wireless interface to manage; repeat for several (default: every adapter)")
+    parser.add_argument('--interval', type=float, default=SCAN_INTERVAL,
+                        help="seconds between scans on an ordinary link")
+    parser.add_argument('--min-interval', type=float, default=MIN_SCAN_INTERVAL,
+                        help="shortest gap between scans, used while the link is weak, falling or down")
+    parser.add_argument('--max-interval', type=float, default=MAX_SCAN_INTERVAL,
+                        help="longest gap between scans, reached while the link stays strong")
+    parser.add_argument('--status-poll', type=float, default=STATUS_POLL_INTERVAL,
+                        help="seconds between passive link status reads while waiting to scan")
+    parser.add_argument('--prefer-band', default=None, choices=[BAND_2_4GHZ, BAND_5GHZ, BAND_6GHZ],
+                        help="prefer APs in this band when an SSID is available on several")
+    parser.add_argument('--once', action='store_true', help="run a single cycle and exit")
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help="serve Prometheus metrics on http://127.0.0.1:PORT/metrics")
+    parser.add_argument('--metrics-file', default=None,
+                        help="append a JSON snapshot of the metrics to this file every minute (rotated at 1 MB)")
+    parser.add_argument('--record-trace', default=None,
+                        help="record scan results and connection changes to this file for benchmarks/bench_replay.py")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='[%(asctime)s] %(message)s', datefmt='%H:%M:%S')
+
+    backends = create_backends(args.backend, args.interface)
+    if args.record_trace:
+        # One trace per adapter: the first keeps the given name, the others add their interface name.
+        root, ext = os.path.splitext(args.record_trace)
+        backends = [RecordingBackend(backend, args.record_trace if i == 0 else f"{root}.{backend.interface_name()}{ext}")
+                    for i, backend in enumerate(backends)]
+    wifi_manager = WiFiSwitcher(json_path=args.config, backends=backends, prefer_band=args.prefer_band)
+    logger.info(f"Managing {', '.join(adapter.name for adapter in wifi_manager.adapters)}")
+    schedule = AdaptiveScanSchedule(base_interval=args.interval, min_interval=args.min_interval,
+                                    max_interval=args.max_interval, poll_interval=args.status_poll)
+    service = SwitchService(wifi_manager, scan_interval=args.interval, scan_schedule=schedule)
+    service.subscribe(_log_event)
+    metrics_server = serve_prometheus(wifi_manager.metrics, args.metrics_port) if args.metrics_port else None
+    exporter = JsonLinesExporter(wifi_manager.metrics, args.metrics_file) if args.metrics_file else None
+    if exporter is not None:
+        exporter.start()
+    wifi_manager.start_status_monitors()
+    wifi_manager.start_watching()
+    try:
+        asyncio.run(service.run_cycle() if args.once else service.run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stats = service.scan_stats()
+        logger.info(f"Scans: {stats['active_scans']} active ({stats['early_scans']} early), "
+                    f"{stats['passive_reads']} passive reads, {stats['scans_saved']} saved vs. a fixed "
+                    f"{args.interval:.0f}s interval")
+        wifi_manager.stop_watching()
+        wifi_manager.stop_status_monitors()
+        service.scheduler.shutdown()
+        if exporter is not None:
+            exporter.stop()
+        if metrics_server is not None:
+            metrics_server.shutdown()
+        if args.record_trace:
+            for backend in backends:
+                backend.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credential_store import CredentialStore
+from simulation import RFEnvironment, SimClock, SimulatedBackend
+from wifi_logic import WiFiSwitcher
+
+
+@pytest.fixture
+def make_switcher(tmp_path):
+    """Builds a WiFiSwitcher over simulated adapters sharing one environment and virtual clock."""
+
+    def make(access_points=(), adapters=1, environment=None, **kwargs):
+        environment = environment or RFEnvironment.static(list(access_points))
+        clock = SimClock()
+        backends = [SimulatedBackend(environment, clock=clock, interface=f'sim{i}') for i in range(adapters)]
+        return WiFiSwitcher(json_path=str(tmp_path / 'networks.json'), backends=backends,
+                            store=CredentialStore.in_memory(), **kwargs)
+
+    return make
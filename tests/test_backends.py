@@ -0,0 +1,87 @@
+import json
+import os
+import stat
+import sys
+
+import pytest
+
+import backends
+import simulation
+from backends import NetworkManagerBackend, PyWiFiBackend
+from simulation import FakeInterface, FakeProfile, RFEnvironment, SimulatedBackend
+
+FAKE_NMCLI = '''#!{python}
+import json, os, stat, sys
+args = sys.argv[1:]
+record = {{'argv': args}}
+if 'passwd-file' in args:
+    path = args[args.index('passwd-file') + 1]
+    record['mode'] = stat.S_IMODE(os.stat(path).st_mode)
+    record['secrets'] = open(path).read()
+with open({log!r}, 'a') as f:
+    f.write(json.dumps(record) + '\\n')
+'''
+
+
+@pytest.fixture
+def nmcli(tmp_path):
+    """A stand-in nmcli that logs every invocation (and any passwd-file it is handed) and succeeds."""
+    log = tmp_path / 'nmcli.log'
+    script = tmp_path / 'nmcli'
+    script.write_text(FAKE_NMCLI.format(python=sys.executable, log=str(log)))
+    script.chmod(0o755)
+
+    def calls():
+        return [json.loads(line) for line in log.read_text().splitlines()]
+
+    return str(script), calls
+
+
+@pytest.mark.skipif(os.name == 'nt', reason="runs a POSIX stand-in for nmcli")
+def test_nmcli_connect_keeps_the_password_off_argv(nmcli):
+    path, calls = nmcli
+    backend = NetworkManagerBackend('wlan0', nmcli=path)
+    assert backend.connect('Home', 's3cret', bssid='aa:aa:aa:aa:aa:01')
+
+    invocations = calls()
+    assert all('s3cret' not in ' '.join(call['argv']) for call in invocations)
+    up = next(call for call in invocations if 'up' in call['argv'])
+    assert up['secrets'] == '802-11-wireless-security.psk:s3cret\n'
+    assert up['mode'] == stat.S_IRUSR | stat.S_IWUSR
+    assert not os.path.exists(up['argv'][up['argv'].index('passwd-file') + 1])
+
+
+def test_pywifi_backend_needs_pywifi_or_injected_stand_ins(monkeypatch):
+    monkeypatch.setattr(backends, 'pywifi', None)
+    with pytest.raises(RuntimeError):
+        PyWiFiBackend(FakeInterface())
+
+    iface = FakeInterface([FakeProfile('Home', 'aa:aa:aa:aa:aa:01', -50, 2437, key='home-pass')])
+    backend = PyWiFiBackend(iface, simulation, FakeProfile)
+    assert backend.interface_name() == 'fake0'
+    assert backend.connect('Home', 'home-pass')
+
+
+def test_simulated_backend_replays_a_roaming_environment():
+    home = FakeProfile('Home', 'aa:aa:aa:aa:aa:01', -50, 2437)
+    office = FakeProfile('Office', 'aa:aa:aa:aa:aa:02', -60, 5180)
+    backend = SimulatedBackend(RFEnvironment([(0, [home]), (100, [office])]))
+
+    def scan():
+        backend.scan()
+        backend.clock.sleep(backend.scan_duration)
+        return {ap.ssid for ap in backend.scan_results()}
+
+    assert scan() == {'Home'}
+    backend.clock.sleep(100)
+    assert scan() == {'Office'}
+
+
+def test_enterprise_connect_passes_the_ssid_as_one_argument(monkeypatch):
+    calls = []
+    monkeypatch.setattr(backends.subprocess, 'run', lambda command, **kwargs: calls.append((command, kwargs)))
+    backend = PyWiFiBackend(FakeInterface(), simulation, FakeProfile)
+    assert backend.connect_enterprise('Cafe" & calc "', 'me', 'pw')
+    command, kwargs = calls[0]
+    assert command == ['netsh', 'wlan', 'connect', 'name=Cafe" & calc "', 'interface=fake0']
+    assert not kwargs.get('shell')
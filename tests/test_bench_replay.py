@@ -0,0 +1,37 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from bench_replay import record_synthetic_trace, replay
+from scan_trace import Trace
+
+KNOWN = ['Home', 'Office']
+
+
+@pytest.fixture(scope='module')
+def trace(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('trace') / 'synthetic.jsonl')
+    record_synthetic_trace(path, steps=400)
+    return Trace.load(path)
+
+
+def test_smoothed_policy_switches_less_than_single_sample(trace):
+    smoothed = replay(trace, KNOWN)
+    single = replay(trace, KNOWN, single_sample=True)
+    assert 0 < smoothed['switches'] < single['switches']
+
+
+def test_second_adapter_hands_off(trace):
+    result = replay(trace, KNOWN, adapters=2)
+    assert result['handoffs'] > 0
+    assert result['disconnected'] <= replay(trace, KNOWN)['disconnected']
+
+
+def test_replay_benchmark(trace, request):
+    pytest.importorskip('pytest_benchmark')
+    benchmark = request.getfixturevalue('benchmark')  # looked up late so the module runs without the plugin
+    result = benchmark(replay, trace, KNOWN)
+    assert result['cycles'] > 0
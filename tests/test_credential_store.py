@@ -0,0 +1,57 @@
+import pytest
+
+from credential_store import CredentialStore
+
+
+@pytest.fixture
+def store():
+    store = CredentialStore.in_memory()
+    yield store
+    store.close()
+
+
+def test_upsert_replaces_and_normalises(store):
+    store.upsert('Home', {'password': 'a', 'priority': '3'})
+    store.upsert('Home', {'password': 'b', 'type': 'enterprise', 'username': 'me'})
+    assert len(store) == 1
+    assert store.get('Home') == {'password': 'b', 'type': 'enterprise', 'priority': 99, 'username': 'me'}
+
+
+def test_delete(store):
+    store.upsert('Home', {'password': 'a'})
+    assert store.delete('Home')
+    assert not store.delete('Home')
+    assert 'Home' not in store
+    assert store.lookup('home') == []
+
+
+def test_lookup_is_case_insensitive_with_exact_match_first(store):
+    store.import_many({'HOME': {'password': 'a'}, 'Home': {'password': 'b'}, 'Office': {'password': 'c'}})
+    assert store.lookup('Home') == ['Home', 'HOME']
+    assert store.lookup('home') in (['HOME', 'Home'], ['Home', 'HOME'])
+    assert store.lookup('OFFICE') == ['Office']
+
+
+def test_secrets_are_stored_through_the_cipher(tmp_path):
+    class ReversingCipher:
+        def encrypt(self, data):
+            return data[::-1]
+
+        def decrypt(self, token):
+            return token[::-1]
+
+    path = str(tmp_path / 'networks.db')
+    store = CredentialStore(path, cipher=ReversingCipher())
+    store.upsert('Home', {'password': 'secret'})
+    store.close()
+    reopened = CredentialStore(path, cipher=ReversingCipher())
+    assert reopened._db.execute('SELECT secret FROM networks').fetchone()[0] == b'terces'
+    assert reopened.get('Home')['password'] == 'secret'
+    reopened.close()
+
+
+def test_priority_zero_is_kept(store):
+    store.upsert('Home', {'password': 'a', 'priority': 0})
+    store.upsert('Office', {'password': 'b', 'priority': None})
+    assert store.get('Home')['priority'] == 0
+    assert store.get('Office')['priority'] == 99
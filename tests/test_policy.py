@@ -0,0 +1,70 @@
+from policy import MIN_DWELL_SECONDS, SWITCH_MARGIN_DB, NetworkRanker, SwitchPolicy
+from signal_history import SignalHistory
+
+
+def policy_with(readings, now=100.0, **kwargs):
+    """readings: {ssid: [dBm, ...]}, recorded one second apart ending at now."""
+    history = SignalHistory()
+    count = max(len(values) for values in readings.values())
+    for step in range(count):
+        scan = {ssid: {'signal': values[step]} for ssid, values in readings.items() if step < len(values)}
+        history.record_scan(scan, now - count + 1 + step)
+    return SwitchPolicy(history, **kwargs)
+
+
+def test_margin_blocks_small_advantage():
+    policy = policy_with({'Home': [-60] * 4, 'Office': [-60 + SWITCH_MARGIN_DB] * 4})
+    switch, _ = policy.should_switch('Home', 'Office', 100.0)
+    assert not switch
+    assert policy.last_reason == 'below_margin'
+
+
+def test_clear_advantage_switches():
+    policy = policy_with({'Home': [-70] * 4, 'Office': [-50] * 4})
+    assert policy.should_switch('Home', 'Office', 100.0)[0]
+    assert policy.last_reason == 'better_signal'
+
+
+def test_single_noisy_reading_does_not_switch():
+    policy = policy_with({'Home': [-60, -60, -60, -60], 'Office': [-70, -70, -70, -40]})
+    assert not policy.should_switch('Home', 'Office', 100.0)[0]
+
+
+def test_dwell_time_blocks_switch_back():
+    policy = policy_with({'Home': [-70] * 4, 'Office': [-50] * 4})
+    policy.record_switch(90.0)
+    switch, _ = policy.should_switch('Home', 'Office', 100.0)
+    assert not switch
+    assert policy.last_reason == 'dwell'
+    assert policy.should_switch('Home', 'Office', 90.0 + MIN_DWELL_SECONDS)[0]
+
+
+def test_disconnected_switches_immediately():
+    policy = policy_with({'Office': [-70] * 2})
+    policy.record_switch(99.0)
+    assert policy.should_switch(None, 'Office', 100.0)[0]
+
+
+def test_ranker_orders_by_priority_then_signal_and_skips_unusable():
+    policy = policy_with({'Home': [-60] * 3, 'Office': [-55] * 3, 'Cafe': [-40] * 3, 'Far': [-90] * 3})
+    ranker = NetworkRanker(policy)
+    known = {'Home': {'priority': 1}, 'Office': {'priority': 5}, 'Far': {'priority': 1}}
+    ranker.update_known_networks(known, version=1)
+    ranked = [ssid for ssid, _ in ranker.rank({'Home': {}, 'Office': {}, 'Cafe': {}, 'Far': {}}, 100.0)]
+    assert ranked == ['Home', 'Office']  # Cafe is unknown, Far is below the usable signal floor
+
+
+def test_ranker_demotes_networks_that_fail_to_connect():
+    policy = policy_with({'Home': [-60] * 3, 'Office': [-60] * 3})
+    ranker = NetworkRanker(policy)
+    ranker.update_known_networks({'Home': {}, 'Office': {}}, version=1)
+    for _ in range(3):
+        ranker.record_attempt('Home', False)
+    assert [ssid for ssid, _ in ranker.rank({'Home': {}, 'Office': {}}, 100.0)] == ['Office', 'Home']
+
+
+def test_ranker_keeps_priority_zero_ahead_of_the_default():
+    policy = policy_with({'Home': [-65] * 3, 'Office': [-60] * 3})
+    ranker = NetworkRanker(policy)
+    ranker.update_known_networks({'Home': {'priority': 0}, 'Office': {'priority': None}}, version=1)
+    assert [ssid for ssid, _ in ranker.rank({'Home': {}, 'Office': {}}, 100.0)] == ['Home', 'Office']
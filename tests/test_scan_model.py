@@ -0,0 +1,29 @@
+from collections import namedtuple
+
+from scan_model import BAND_2_4GHZ, BAND_5GHZ, ScanTable
+
+Result = namedtuple('Result', ['ssid', 'bssid', 'signal', 'freq', 'akm'])
+
+
+def test_repeated_bssid_keeps_strongest_reading():
+    table = ScanTable.from_results([
+        Result('Home', 'AA:AA:AA:AA:AA:01', -70, 2437, []),
+        Result('Home', 'aa:aa:aa:aa:aa:01', -55, 2437, []),
+        Result('Home', 'aa:aa:aa:aa:aa:01', -65, 2437, []),
+    ])
+    assert len(table) == 1
+    assert table.strongest('Home').signal == -55
+
+
+def test_summary_and_band_preference():
+    table = ScanTable.from_results([
+        Result('Home', 'aa:01', -50, 2437, []),
+        Result('Home', 'aa:02', -60, 5180000, []),  # kHz, as the Windows WLAN API reports it
+        Result('', 'aa:03', -40, 2412, []),         # hidden SSIDs are skipped
+    ])
+    networks = table.to_networks_dict()
+    assert list(networks) == ['Home']
+    assert networks['Home']['signal'] == -50
+    assert networks['Home']['ap_count'] == 2
+    assert networks['Home']['bands'] == (BAND_2_4GHZ, BAND_5GHZ)
+    assert table.strongest('Home', BAND_5GHZ).bssid == 'aa:02'
@@ -0,0 +1,50 @@
+import threading
+import time
+
+from backends import Backend
+from status_monitor import StatusMonitor
+
+
+class CountingBackend(Backend):
+    def __init__(self, watchable):
+        self.watchable = watchable
+        self.connection = ('Home', 80)
+        self.queries = 0
+        self.callback = None
+
+    def current_connection(self):
+        self.queries += 1
+        return self.connection
+
+    def watch(self, callback):
+        if not self.watchable:
+            return None
+        self.callback = callback
+        return lambda: None
+
+
+def start_monitor(backend):
+    monitor = StatusMonitor(backend, refresh_interval=0.05, watched_refresh_interval=10.0)
+    monitor.start()
+    time.sleep(0.3)
+    return monitor
+
+
+def test_polls_without_change_events():
+    backend = CountingBackend(watchable=False)
+    start_monitor(backend).stop()
+    assert backend.queries >= 4
+
+
+def test_change_events_replace_polling():
+    backend = CountingBackend(watchable=True)
+    monitor = start_monitor(backend)
+    assert backend.queries == 1
+
+    changed = threading.Event()
+    monitor.add_listener(lambda snapshot: changed.set())
+    backend.connection = ('Office', 60)
+    backend.callback()
+    assert changed.wait(1.0)
+    assert monitor.snapshot().ssid == 'Office'
+    monitor.stop()
@@ -0,0 +1,100 @@
+import threading
+import time
+
+from policy import SwitchPolicy
+from simulation import FakeProfile
+from switch_service import SwitchService
+
+HOME = FakeProfile('Home', 'aa:aa:aa:aa:aa:01', -45, 2437, key='home-pass')
+OFFICE = FakeProfile('Office', 'aa:aa:aa:aa:aa:02', -50, 5180, key='office-pass')
+
+
+def test_connect_falls_through_to_next_candidate(make_switcher):
+    switcher = make_switcher([HOME, OFFICE])
+    switcher.add_network('Home', 'wrong-pass', priority=1)
+    switcher.add_network('Office', 'office-pass', priority=2)
+    service = SwitchService(switcher)
+    events = []
+    service.subscribe(lambda event, data: events.append((event, data.get('ssid'))))
+
+    candidates, _ = service.decide(None, switcher.scan_available_networks(), switcher.clock.monotonic())
+    assert candidates == ['Home', 'Office']
+    assert service.connect_first(candidates) == 'Office'
+    assert ('connect_failed', 'Home') in events
+    assert service.ranker.success_rate('Home') < service.ranker.success_rate('Office')
+
+
+def test_decide_stays_on_best_network(make_switcher):
+    switcher = make_switcher([HOME, OFFICE])
+    switcher.add_network('Home', 'home-pass', priority=1)
+    switcher.add_network('Office', 'office-pass', priority=2)
+    service = SwitchService(switcher)
+    candidates, _ = service.decide('Home', switcher.scan_available_networks(), switcher.clock.monotonic())
+    assert candidates == []
+
+
+def test_failed_handoff_is_not_reported_as_a_switch(make_switcher):
+    strong_office = FakeProfile('Office', 'aa:aa:aa:aa:aa:02', -30, 5180, key='office-pass')
+    switcher = make_switcher([HOME, strong_office], adapters=2)
+    switcher.add_network('Home', 'home-pass', priority=1)
+    switcher.add_network('Office', 'wrong-pass', priority=1)
+    assert switcher.connect_to_known_network('Home')
+    service = SwitchService(switcher)
+    service.switch_policy = SwitchPolicy(service.signal_history, min_dwell=0, min_samples=1, alpha=1.0)
+    service.ranker.policy = service.switch_policy
+    events = []
+    service.subscribe(lambda event, data: events.append(event))
+
+    candidates, _ = service.decide('Home', switcher.scan_available_networks(), switcher.clock.monotonic())
+    assert candidates == ['Office']
+    assert service.connect_first(candidates) is None
+    assert 'connected' not in events
+    assert switcher.get_current_connection()[0] == 'Home'
+    assert switcher.handoffs.value() == 0
+
+
+def test_restart_after_stop_leaves_the_service_running(make_switcher):
+    switcher = make_switcher([HOME])
+    service = SwitchService(switcher)
+    service.start_in_thread()
+    service.stop_thread()
+    service.start_in_thread()
+    try:
+        assert service._thread.is_alive()
+    finally:
+        service.stop_thread()
+    assert not service._thread.is_alive()
+
+
+def test_stop_waits_only_up_to_its_timeout_for_a_blocked_service(make_switcher):
+    switcher = make_switcher([HOME])
+    service = SwitchService(switcher)
+    blocking, release = threading.Event(), threading.Event()
+
+    def slow_subscriber(event, data):
+        if blocking.is_set():
+            release.wait()
+
+    service.subscribe(slow_subscriber)
+    blocking.set()
+    service.start_in_thread()
+    start = time.monotonic()
+    assert not service.stop_thread(timeout=0.2)
+    assert time.monotonic() - start < 1.0
+
+    release.set()
+    blocking.clear()
+    service.start_in_thread()  # waits for the old thread to finish stopping, then starts afresh
+    try:
+        assert service._thread.is_alive()
+    finally:
+        assert service.stop_thread()
+
+
+def test_finish_cycle_schedules_the_next_scan(make_switcher):
+    switcher = make_switcher([HOME])
+    service = SwitchService(switcher)
+    assert service.finish_cycle('Home', 90, [], "already on the best network", None) is None
+    assert service.scan_schedule.interval > service.scan_interval  # strong, steady link: back off
+    assert service.finish_cycle('Home', 90, ['Office'], "better signal", None) is None
+    assert service.scan_schedule.interval == service.scan_schedule.min_interval  # failed switch: look again soon
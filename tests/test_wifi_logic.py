@@ -0,0 +1,194 @@
+import json
+
+import credential_store
+from simulation import FakeProfile, RFEnvironment, SimClock, SimulatedBackend
+from wifi_logic import DROPPED, SCAN_MIN_WAIT, SCAN_TIMEOUT, WiFiSwitcher
+
+HOME = FakeProfile('Home', 'aa:aa:aa:aa:aa:01', -50, 2437, key='home-pass')
+OFFICE = FakeProfile('Office', 'aa:aa:aa:aa:aa:02', -60, 5180, key='office-pass')
+
+
+def scan_time(switcher):
+    start = switcher.clock.monotonic()
+    networks = switcher.scan_available_networks()
+    return switcher.clock.monotonic() - start, networks
+
+
+def test_scan_settles_well_before_the_legacy_fixed_sleep(make_switcher):
+    elapsed, networks = scan_time(make_switcher([HOME, OFFICE]))
+    assert set(networks) == {'Home', 'Office'}
+    assert elapsed < 2.0  # the original loop slept a fixed 5 s
+
+
+def test_empty_scan_settles_after_min_wait(make_switcher):
+    elapsed, networks = scan_time(make_switcher())
+    assert networks == {}
+    assert SCAN_MIN_WAIT <= elapsed < SCAN_TIMEOUT
+
+
+class JitteryBackend(SimulatedBackend):
+    """Reports every signal 1 dB higher or lower on alternate polls, as real drivers do."""
+
+    polls = 0
+
+    def scan_results(self):
+        self.polls += 1
+        offset = 1 if self.polls % 2 else -1
+        return [FakeProfile(ap.ssid, ap.bssid, ap.signal + offset, ap.freq) for ap in super().scan_results()]
+
+
+def test_signal_jitter_does_not_stop_a_scan_settling(tmp_path):
+    backend = JitteryBackend(RFEnvironment.static([HOME, OFFICE]))
+    switcher = WiFiSwitcher(json_path=str(tmp_path / 'networks.json'), backend=backend,
+                            store=credential_store.CredentialStore.in_memory())
+    elapsed, networks = scan_time(switcher)
+    assert set(networks) == {'Home', 'Office'}
+    assert elapsed < SCAN_MIN_WAIT
+
+
+def test_blind_adapter_does_not_hold_up_the_scan(tmp_path):
+    clock = SimClock()
+    working = SimulatedBackend(RFEnvironment.static([HOME, OFFICE]), clock=clock, interface='sim0')
+    blind = SimulatedBackend(RFEnvironment.static([]), clock=clock, interface='sim1')
+    switcher = WiFiSwitcher(json_path=str(tmp_path / 'networks.json'), backends=[working, blind],
+                            store=credential_store.CredentialStore.in_memory())
+    elapsed, networks = scan_time(switcher)
+    assert set(networks) == {'Home', 'Office'}
+    assert elapsed < SCAN_MIN_WAIT
+
+
+def test_connect_reuses_installed_profile(make_switcher):
+    switcher = make_switcher([HOME])
+    switcher.add_network('Home', 'home-pass')
+    backend = switcher.backend
+    installs = []
+    original_connect = backend.connect
+    backend.connect = lambda *args: installs.append(args) or original_connect(*args)
+
+    assert switcher.connect_to_known_network('Home')
+    backend.disconnect()
+    assert switcher.connect_to_known_network('Home')
+
+    assert len(installs) == 1  # the second connect only activated the existing profile
+    assert backend.connect_count == 2
+    assert switcher.get_current_connection()[0] == 'Home'
+
+
+def test_stale_profile_is_reinstalled(make_switcher):
+    switcher = make_switcher([HOME])
+    switcher.backend.profiles['Home'] = 'old-pass'  # installed outside the app with an old password
+    switcher.add_network('Home', 'home-pass')
+
+    assert switcher.connect_to_known_network('Home')
+    assert switcher.backend.profiles['Home'] == 'home-pass'
+
+
+def test_rejected_key_fails_fast_then_recovers_after_password_fix(make_switcher):
+    switcher = make_switcher([HOME])
+    switcher.add_network('Home', 'wrong-pass')
+    start = switcher.clock.monotonic()
+
+    assert not switcher.connect_to_known_network('Home')
+    assert switcher.clock.monotonic() - start < 5.0  # well under CONNECT_TIMEOUT
+    assert switcher.connect_attempts.value(kind='personal', outcome=DROPPED) == 1
+
+    switcher.add_network('Home', 'home-pass')
+    assert switcher.connect_to_known_network('Home')
+
+
+def test_apply_json_changes_upserts_and_deletes(make_switcher, tmp_path):
+    path = tmp_path / 'networks.json'
+    path.write_text(json.dumps({'Home': {'password': 'a'}, 'Old': {'password': 'b'}}))
+    switcher = make_switcher()
+    switcher.add_network('Mine', 'c')
+    before = switcher.known_networks
+
+    path.write_text(json.dumps({'Home': {'password': 'a2', 'priority': 1}, 'New': {'password': 'd'}}))
+    assert switcher.apply_json_changes() == 3
+
+    assert set(switcher.known_networks) == {'Home', 'New', 'Mine'}
+    assert switcher.known_networks['Home']['password'] == 'a2'
+    assert switcher.store.get('Old') is None
+    assert set(before) == {'Home', 'Old', 'Mine'}  # earlier snapshots are never mutated
+
+
+def test_apply_json_changes_ignores_invalid_and_missing_files(make_switcher, tmp_path):
+    path = tmp_path / 'networks.json'
+    path.write_text(json.dumps({'Home': {'password': 'a'}}))
+    switcher = make_switcher()
+
+    path.write_text('{not json')
+    try:
+        switcher.apply_json_changes()
+    except ValueError:
+        pass
+    path.unlink()
+    assert switcher.apply_json_changes() == 0
+    assert set(switcher.known_networks) == {'Home'}
+
+
+def test_edits_saved_while_stopped_are_applied_on_start(tmp_path):
+    path = tmp_path / 'networks.json'
+    path.write_text(json.dumps({'Home': {'password': 'a'}, 'Old': {'password': 'b'}}))
+
+    def start():
+        store = credential_store.CredentialStore(str(tmp_path / 'networks.db'), cipher=credential_store._InMemoryCipher())
+        return WiFiSwitcher(json_path=str(path), backend=SimulatedBackend(RFEnvironment.static([])), store=store)
+
+    first = start()
+    first.add_network('Mine', 'c')
+    first.store.close()
+    path.write_text(json.dumps({'Home': {'password': 'a2'}, 'Site2': {'password': 'd'}}))
+
+    second = start()
+    assert set(second.known_networks) == {'Home', 'Site2', 'Mine'}
+    assert second.known_networks['Home']['password'] == 'a2'
+    assert second.apply_json_changes() == 0
+    second.store.close()
+
+
+def test_config_listeners_run_after_the_write_lock_is_released(make_switcher, tmp_path):
+    switcher = make_switcher()
+    held = []
+    switcher.add_config_listener(lambda snapshot: held.append(switcher._write_lock.locked()))
+    switcher.add_network('Home', 'a')
+    (tmp_path / 'networks.json').write_text(json.dumps({'Office': {'password': 'b'}}))
+    switcher.apply_json_changes()
+    switcher.remove_network('Home')
+    assert held == [False, False, False]
+
+
+def test_missing_cipher_serves_json_and_refuses_unsaved_edits(tmp_path, monkeypatch):
+    def no_cipher(db_path):
+        raise RuntimeError("no cipher")
+
+    monkeypatch.setattr(credential_store, 'default_cipher', no_cipher)
+    path = tmp_path / 'networks.json'
+    path.write_text(json.dumps({'Home': {'password': 'home-pass'}}))
+    switcher = WiFiSwitcher(json_path=str(path), backend=SimulatedBackend(RFEnvironment.static([HOME])))
+    assert switcher.store.path == ':memory:'
+    assert switcher.known_networks['Home']['password'] == 'home-pass'
+    assert not switcher.add_network('New', 'new-pass')
+    assert not switcher.remove_network('Home')
+    assert set(switcher.known_networks) == {'Home'}
+    assert not (tmp_path / 'networks.db').exists()
+
+
+def test_connecting_to_the_current_network_is_a_no_op(make_switcher):
+    switcher = make_switcher([HOME, OFFICE], adapters=2)
+    switcher.add_network('Home', 'home-pass')
+    assert switcher.connect_to_known_network('Home')
+    assert switcher.connect_to_known_network('Home')
+    assert switcher.handoffs.value() == 0
+    assert switcher.backend.current_connection()[0] == 'Home'
+
+
+def test_passive_status_reads_reuse_a_snapshot_within_max_age(make_switcher):
+    switcher = make_switcher([HOME])
+    switcher.get_current_connection()
+    refreshes = switcher.status_monitor.refresh_count
+    switcher.clock.sleep(4.0)
+    switcher.get_current_connection(max_age=5.0)
+    assert switcher.status_monitor.refresh_count == refreshes
+    switcher.get_current_connection()  # past the default TTL
+    assert switcher.status_monitor.refresh_count == refreshes + 1
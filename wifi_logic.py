@@ -1,120 +1,514 @@
-import pywifi
-from pywifi import const
-import time
 import json
-import subprocess
+import logging
 import os
+import threading
+from types import MappingProxyType
+
+from backends import STATUS_CONNECTED, STATUS_CONNECTING, STATUS_DISCONNECTED, STATUS_INACTIVE, create_backends
+from config_watcher import ConfigWatcher
+from credential_store import CredentialStore
+from metrics import MetricsRegistry
+from profiles import ProfileRegistry
+from scan_model import ScanTable
+from status_monitor import StatusMonitor
+
+# Scan tuning: results are polled until they settle instead of sleeping a fixed 5 s.
+SCAN_TIMEOUT = 8.0          # hard deadline for a single scan, in seconds
+SCAN_MIN_WAIT = 2.0         # accept unchanged cached results only after this long
+SCAN_POLL_INTERVAL = 0.2    # first poll delay; grows by SCAN_POLL_BACKOFF
+SCAN_POLL_BACKOFF = 1.5
+SCAN_POLL_MAX = 1.0
+
+# Connect tuning: association is polled with exponential backoff instead of a flat 10 s sleep.
+CONNECT_TIMEOUT = 15.0      # give up on an association after this long
+CONNECT_POLL_INTERVAL = 0.25
+CONNECT_POLL_MAX = 2.0
+DISCONNECT_TIMEOUT = 2.0    # longest wait for the interface to go idle before connecting
+
+# Connect outcomes, used as the 'outcome' label of wifi_connect_attempts_total.
+CONNECTED = 'connected'
+REJECTED = 'rejected'       # the backend refused to start the association
+DROPPED = 'dropped'         # association started, then fell back to disconnected (e.g. a wrong key)
+TIMED_OUT = 'timeout'
+CANCELLED = 'cancelled'
+
+logger = logging.getLogger(__name__)
+
+
+def _scan_fingerprint(results):
+    """Returns a hashable summary of scan results, used to tell new results from the pre-scan cache."""
+    return tuple(sorted((getattr(p, 'bssid', None) or '', p.ssid or '', p.signal) for p in results))
+
+
+def _scan_members(results):
+    """The (BSSID, SSID) pairs in scan results. RSSI jitters between polls, so stability ignores it."""
+    return frozenset((getattr(p, 'bssid', None) or '', p.ssid or '') for p in results)
+
+
+def _cancelled(cancel_event):
+    return cancel_event is not None and cancel_event.is_set()
+
+
+class Adapter:
+    """One wireless interface with its own status cache and installed-profile registry."""
+    __slots__ = ('backend', 'status_monitor', 'profiles')
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.status_monitor = StatusMonitor(backend)
+        self.profiles = ProfileRegistry(backend)
+
+    @property
+    def name(self):
+        return self.backend.interface_name()
 
 
 class WiFiSwitcher:
-    def __init__(self, json_path='networks.json'):
-        self.pywifi = pywifi.PyWiFi()
-        self.iface = self.pywifi.interfaces()[0]
+    """
+    Manages every wireless adapter it is given (all of them by default). One adapter
+    carries the connection; scans run on all of them at once, and with a second
+    adapter available a switch associates on the standby before the active link
+    is dropped (make-before-break), after which the two swap roles.
+    """
+
+    def __init__(self, json_path='networks.json', backend=None, scan_timeout=SCAN_TIMEOUT,
+                 scan_min_wait=SCAN_MIN_WAIT, scan_poll_interval=SCAN_POLL_INTERVAL, prefer_band=None,
+                 store=None, metrics=None, backends=None):
+        if backends is None:
+            backends = [backend] if backend is not None else create_backends()
+        self.adapters = [Adapter(b) for b in backends]
+        self.clock = self.adapters[0].backend.clock
+        self._active = next((i for i, adapter in enumerate(self.adapters)
+                             if adapter.backend.status() == STATUS_CONNECTED), 0)
+        self.metrics = metrics if metrics is not None else MetricsRegistry()
+        self.scan_latency = self.metrics.histogram('wifi_scan_seconds', "Time from triggering a scan to settled results")
+        self.scans = self.metrics.counter('wifi_scans_total', "Completed scans")
+        self.connect_latency = self.metrics.histogram('wifi_connect_seconds', "Time to association for successful connects")
+        self.connect_attempts = self.metrics.counter('wifi_connect_attempts_total', "Connect attempts by outcome",
+                                                     label_names=('kind', 'outcome'))
+        self.handoffs = self.metrics.counter('wifi_handoffs_total', "Make-before-break handoffs between adapters")
+        self._connect_lock = threading.Lock()  # one association at a time across all adapters
+        self.scan_timeout = scan_timeout
+        self.scan_min_wait = scan_min_wait
+        self.scan_poll_interval = scan_poll_interval
+        self.prefer_band = prefer_band  # e.g. scan_model.BAND_5GHZ to favour 5 GHz APs when connecting
+        self.last_scan = ScanTable()
         self.json_path = json_path
-        self.known_networks = self.load_known_networks()
+        self.store_unavailable = None  # why app edits cannot be saved, when the store is a stand-in
+        self.store = store if store is not None else self._open_store(json_path)
+        self._write_lock = threading.Lock()  # serialises writers; readers never lock
+        self._config_listeners = []
+        self._config = (0, MappingProxyType({}))  # (version, immutable snapshot), swapped as one reference
+        self._provisioned = self.store.provisioned()  # networks.json content last applied to the store
+        if self._provisioned is None:
+            self._provisioned = self.load_known_networks()
+            self._import_legacy_json(self._provisioned)
+        self._publish(self.store.as_dict())
+        try:
+            self.apply_json_changes()  # edits saved while the app was not running
+        except ValueError as e:
+            logger.warning(f"⚠️ Not applying {json_path}: {e}")
+        self.config_watcher = ConfigWatcher(json_path, lambda path: self.apply_json_changes())
 
-    def load_known_networks(self):
-        """Loads known network credentials from the JSON file."""
+    @property
+    def active_adapter(self):
+        return self.adapters[self._active]
+
+    @property
+    def backend(self):
+        """The backend of the adapter currently carrying the connection."""
+        return self.active_adapter.backend
+
+    @property
+    def status_monitor(self):
+        return self.active_adapter.status_monitor
+
+    @property
+    def profiles(self):
+        return self.active_adapter.profiles
+
+    def standby_adapter(self):
+        """An adapter other than the active one, or None with a single adapter."""
+        return next((adapter for adapter in self.adapters if adapter is not self.active_adapter), None)
+
+    def start_status_monitors(self):
+        for adapter in self.adapters:
+            adapter.status_monitor.start()
+
+    def stop_status_monitors(self):
+        for adapter in self.adapters:
+            adapter.status_monitor.stop()
+
+    def _forget_profiles(self, ssid):
+        for adapter in self.adapters:
+            adapter.profiles.forget(ssid)
+
+    @property
+    def known_networks(self):
+        """The current immutable {ssid: details} snapshot. Safe to iterate while writers publish new ones."""
+        return self._config[1]
+
+    @property
+    def config_version(self):
+        """Bumped every time a new known_networks snapshot is published."""
+        return self._config[0]
+
+    def config_snapshot(self):
+        """Returns (version, known_networks) taken together, for callers that cache by version."""
+        return self._config
+
+    def add_config_listener(self, callback):
+        """
+        Registers callback(snapshot), called whenever known_networks changes. It runs on the
+        writer's thread after the write lock is released, so it may block or call back in.
+        """
+        self._config_listeners.append(callback)
+
+    def _publish(self, networks):
+        """Swaps in a new snapshot built from networks; readers holding the old one are unaffected."""
+        snapshot = MappingProxyType({
+            ssid: details if isinstance(details, MappingProxyType) else MappingProxyType(dict(details))
+            for ssid, details in networks.items()
+        })
+        self._config = (self._config[0] + 1, snapshot)
+
+    def _notify_config_listeners(self):
+        """Hands listeners the latest snapshot; called by writers once they have released the lock."""
+        snapshot = self.known_networks
+        for callback in list(self._config_listeners):
+            callback(snapshot)
+
+    def _read_json(self):
+        """Reads json_path, raising on invalid content; a missing file counts as empty."""
         if not os.path.exists(self.json_path):
             return {}
+        with open(self.json_path, 'r') as f:
+            return json.load(f)
+
+    def load_known_networks(self):
+        """Loads known network credentials from the JSON file."""
         try:
-            with open(self.json_path, 'r') as f:
-                networks = json.load(f)
-                print(f"✅ Successfully loaded {len(networks)} networks from {self.json_path}")
-                return networks
+            networks = self._read_json()
+            if networks:
+                logger.info(f"✅ Successfully loaded {len(networks)} networks from {self.json_path}")
+            return networks
         except (json.JSONDecodeError, FileNotFoundError) as e:
-            print(f"⚠️ Error loading {self.json_path}: {e}. Starting with an empty list.")
+            logger.warning(f"⚠️ Error loading {self.json_path}: {e}. Starting with an empty list.")
             return {}
 
-    def _save_networks_to_json(self):
+    def _open_store(self, json_path):
         """
-        Saves the current known_networks dict to the JSON file atomically.
-        Writes to a temporary file first, then renames it to prevent corruption.
+        Opens the encrypted store next to json_path. If nothing can encrypt it, networks are
+        served from json_path through an in-memory store and edits made in the app are refused.
         """
-        temp_path = self.json_path + ".tmp"
         try:
-            with open(temp_path, 'w') as f:
-                json.dump(self.known_networks, f, indent=4)
-            # If write is successful, replace the original file
-            os.replace(temp_path, self.json_path)
-            return True
-        except Exception as e:
-            print(f"❌ Error saving to {self.json_path}: {e}")
-            return False
+            return CredentialStore(os.path.splitext(json_path)[0] + '.db')
+        except RuntimeError as e:
+            self.store_unavailable = str(e)
+            logger.error(f"❌ {e} Networks are read from {json_path} only; saving or removing networks "
+                         f"in the app is disabled until it is installed.")
+            return CredentialStore.in_memory()
+
+    def _import_legacy_json(self, networks):
+        """
+        Records networks as the applied content of json_path on the first run against this
+        store; an empty store imports them too, moving them out of the plaintext file.
+        """
+        imported = networks if not len(self.store) else {}
+        self.store.apply_provisioning(networks, imported, [])
+        if imported and self.store.path != ':memory:':  # in memory nothing moved; json_path is still the only copy
+            logger.info(f"🔒 Imported {len(networks)} networks into {self.store.path}. "
+                  f"{self.json_path} still holds plaintext passwords; delete it once you have checked the import.")
+
+    def apply_json_changes(self):
+        """
+        Applies edits made to json_path since it was last read: networks added or changed
+        there are upserted, networks removed from it are deleted. Networks added through
+        the app are left alone. Deleting the file changes nothing. Returns the number of networks changed.
+        """
+        if not os.path.exists(self.json_path):
+            return 0
+        networks = self._read_json()  # invalid JSON raises, so a half-written file never wipes anything
+        with self._write_lock:
+            previous = self._provisioned
+            changed = {ssid: details for ssid, details in networks.items() if previous.get(ssid) != details}
+            removed = [ssid for ssid in previous if ssid not in networks]
+            if not changed and not removed:
+                return 0
+            self.store.apply_provisioning(networks, changed, removed)
+            self._provisioned = networks
+            current = dict(self.known_networks)
+            for ssid, details in changed.items():
+                if current.get(ssid, {}).get('password') != details.get('password'):
+                    self._forget_profiles(ssid)
+                current[ssid] = self.store.get(ssid)
+            for ssid in removed:
+                current.pop(ssid, None)
+            self._publish(current)
+        self._notify_config_listeners()
+        logger.info(f"🔄 Applied {len(changed)} updated and {len(removed)} removed networks from {self.json_path}")
+        return len(changed) + len(removed)
+
+    def start_watching(self):
+        """Applies edits to json_path in the background as soon as they are saved."""
+        self.config_watcher.start()
+
+    def stop_watching(self):
+        self.config_watcher.stop()
 
     def add_network(self, ssid, password, network_type='home', priority=99, username=None):
-        """Adds or updates a network in our list and saves to JSON."""
-        self.known_networks[ssid] = {
+        """Adds or updates a network in our list and saves it to the credential store."""
+        details = {
             "password": password,
             "type": network_type,
             "priority": priority,
             "username": username
         }
-        return self._save_networks_to_json()
+        if self.store_unavailable:
+            logger.error(f"❌ Cannot save '{ssid}': {self.store_unavailable}")
+            return False
+        with self._write_lock:
+            if self.known_networks.get(ssid, {}).get('password') != password:
+                self._forget_profiles(ssid)  # installed OS profiles carry the old password
+            try:
+                self.store.upsert(ssid, details)
+            except Exception as e:
+                logger.error(f"❌ Error saving '{ssid}' to {self.store.path}: {e}")
+                return False
+            self._publish({**self.known_networks, ssid: details})
+        self._notify_config_listeners()
+        return True
 
     def remove_network(self, ssid_to_remove):
-        """Removes a network from our list and saves the change to JSON."""
-        if ssid_to_remove in self.known_networks:
-            del self.known_networks[ssid_to_remove]
-            return self._save_networks_to_json()
-        return False
+        """Removes a network from our list and from the credential store."""
+        if self.store_unavailable:
+            logger.error(f"❌ Cannot remove '{ssid_to_remove}': {self.store_unavailable}")
+            return False
+        with self._write_lock:
+            if ssid_to_remove not in self.known_networks:
+                return False
+            try:
+                self.store.delete(ssid_to_remove)
+            except Exception as e:
+                logger.error(f"❌ Error removing '{ssid_to_remove}' from {self.store.path}: {e}")
+                return False
+            self._publish({ssid: details for ssid, details in self.known_networks.items() if ssid != ssid_to_remove})
+        self._notify_config_listeners()
+        return True
+
+    def find_networks(self, name):
+        """Returns saved SSIDs matching name case-insensitively, an exact match first."""
+        return self.store.lookup(name)
 
     def scan_available_networks(self):
-        """Scans for all available networks and returns them in a dictionary."""
-        self.iface.scan()
-        time.sleep(5)
-        scan_results = self.iface.scan_results()
-        networks_dict = {}
-        for profile in scan_results:
-            ssid = profile.ssid
-            signal_dbm = profile.signal
-            if ssid:  # Only add if SSID is not empty
-                networks_dict[ssid] = {'signal': signal_dbm}
-        return networks_dict
-
-    def get_current_connection(self):
-        """Returns the currently connected SSID and signal strength."""
-        try:
-            result = subprocess.check_output(['netsh', 'wlan', 'show', 'interfaces'], encoding='utf-8', errors='ignore')
-            current_ssid = None
-            signal_percent = None
-            for line in result.split('\n'):
-                if "SSID" in line and "BSSID" not in line:
-                    current_ssid = line.split(":")[1].strip()
-                if "Signal" in line:
-                    signal_percent = int(line.split(":")[1].strip().replace('%', ''))
-            return current_ssid, signal_percent
-        except Exception:
-            return None, None
-
-    def connect_to_network(self, ssid, password):
-        """Connects to a standard WPA2-Personal network."""
-        self.iface.disconnect()
-        time.sleep(2)
-        profile = pywifi.Profile()
-        profile.ssid = ssid
-        profile.auth = const.AUTH_ALG_OPEN
-        profile.akm.append(const.AKM_TYPE_WPA2PSK)
-        profile.cipher = const.CIPHER_TYPE_CCMP
-        profile.key = password
-        tmp_profile = self.iface.add_network_profile(profile)
-        self.iface.connect(tmp_profile)
-        time.sleep(10)
-        return self.iface.status() == const.IFACE_CONNECTED
-
-    def connect_to_enterprise_network(self, ssid, username, password):
-        """Connects to an enterprise network using a pre-existing Windows profile."""
-        self.iface.disconnect()
-        time.sleep(2)
-        command = f'netsh wlan connect name="{ssid}"'
-        try:
-            subprocess.run(command, shell=True, check=True, capture_output=True, text=True, errors='ignore')
-            for _ in range(10):  # Check for up to 30 seconds
-                time.sleep(3)
-                current_ssid, _ = self.get_current_connection()
-                if current_ssid == ssid:
-                    return True
+        """
+        Scans for all available networks and returns them in a dictionary keyed by SSID.
+        'signal' is the strongest AP for that SSID; the per-BSSID table is kept in last_scan.
+        """
+        start = self.clock.monotonic()
+        self.last_scan = ScanTable.from_results(self._scan_until_settled())
+        self.scan_latency.observe(self.clock.monotonic() - start)
+        self.scans.inc()
+        return self.last_scan.to_networks_dict()
+
+    def pick_bssid(self, ssid):
+        """Returns the BSSID to target for ssid: the strongest AP, in prefer_band if one is visible there."""
+        record = None
+        if self.prefer_band:
+            record = self.last_scan.strongest(ssid, self.prefer_band)
+        record = record or self.last_scan.strongest(ssid)
+        return record.bssid if record is not None and record.bssid else None
+
+    def _scan_until_settled(self):
+        """
+        Triggers a scan on every adapter at once and polls their scan_results() until each
+        settles or scan_timeout passes, returning all results together.
+        An adapter's results count as settled once two consecutive polls see the same
+        access points (signal readings may differ) and the results either differed from
+        its pre-scan cache at some point or scan_min_wait has elapsed. Empty results
+        (nothing in range) settle once they are unchanged after scan_min_wait, and once
+        every adapter that sees something has settled, adapters still seeing nothing
+        are no longer waited for.
+        """
+        backends = [adapter.backend for adapter in self.adapters]
+        before = [_scan_fingerprint(backend.scan_results()) for backend in backends]
+        for backend in backends:
+            backend.scan()
+        start = self.clock.monotonic()
+        deadline = start + self.scan_timeout
+        delay = self.scan_poll_interval
+        previous = [None] * len(backends)
+        fresh = [False] * len(backends)
+        latest = [[] for _ in backends]
+        settled = [False] * len(backends)
+        while True:
+            self.clock.sleep(max(0.0, min(delay, deadline - self.clock.monotonic())))
+            now = self.clock.monotonic()
+            for i, backend in enumerate(backends):
+                if settled[i]:
+                    continue
+                results = backend.scan_results()
+                current = _scan_members(results)
+                waited = now - start >= self.scan_min_wait
+                fresh[i] = fresh[i] or waited or _scan_fingerprint(results) != before[i]
+                settled[i] = fresh[i] and current == previous[i] and (bool(results) or waited)
+                previous[i] = current
+                latest[i] = results
+            heard = [i for i, results in enumerate(latest) if results]
+            if all(settled) or (heard and all(settled[i] for i in heard)) or now >= deadline:
+                return [result for results in latest for result in results]
+            delay = min(delay * SCAN_POLL_BACKOFF, SCAN_POLL_MAX)
+
+    def get_current_connection(self, max_age=None):
+        """
+        Returns the currently connected SSID and signal strength from the shared status cache,
+        querying the OS only if the cached reading is older than max_age (default: the cache TTL).
+        """
+        snapshot = self.status_monitor.get(max_age)
+        return snapshot.ssid, snapshot.signal
+
+    def connect_to_known_network(self, ssid, cancel_event=None):
+        """Connects to a saved network using its stored type and credentials."""
+        network_details = self.known_networks.get(ssid)
+        if not network_details:
             return False
-        except subprocess.CalledProcessError as e:
-            print(f"❌ Error executing netsh command for '{ssid}': {e.stderr}")
-            return False
\ No newline at end of file
+        bssid = self.pick_bssid(ssid)
+        if network_details.get('type', 'home') == 'enterprise':
+            return self.connect_to_enterprise_network(ssid, network_details.get('username'),
+                                                      network_details.get('password'), cancel_event, bssid)
+        return self.connect_to_network(ssid, network_details.get('password'), cancel_event, bssid)
+
+    def _wait_until(self, predicate, timeout, cancel_event=None):
+        """
+        Polls predicate() with exponential backoff until it returns a non-None result.
+        Returns False on timeout or once cancel_event is set.
+        """
+        deadline = self.clock.monotonic() + timeout
+        delay = CONNECT_POLL_INTERVAL
+        while True:
+            result = predicate()
+            if result is not None:
+                return result
+            if _cancelled(cancel_event):
+                return False
+            remaining = deadline - self.clock.monotonic()
+            if remaining <= 0:
+                return False
+            self.clock.sleep(min(delay, remaining))
+            delay = min(delay * 2, CONNECT_POLL_MAX)
+
+    def _disconnect_if_needed(self, adapter):
+        """Disconnects and waits for the interface to go idle; skipped when it already is."""
+        backend = adapter.backend
+        if backend.status() in (STATUS_DISCONNECTED, STATUS_INACTIVE):
+            return
+        backend.disconnect()
+        adapter.status_monitor.invalidate()
+        self._wait_until(lambda: True if backend.status() in (STATUS_DISCONNECTED, STATUS_INACTIVE) else None,
+                         DISCONNECT_TIMEOUT)
+
+    def _wait_for_association(self, adapter, cancel_event=None):
+        """
+        Waits for the backend to report a connection; fails fast if an attempt visibly drops.
+        Returns CONNECTED, DROPPED, TIMED_OUT or CANCELLED.
+        """
+        seen_connecting = False
+
+        def associated():
+            nonlocal seen_connecting
+            status = adapter.backend.status()
+            if status == STATUS_CONNECTED:
+                return CONNECTED
+            if status == STATUS_CONNECTING:
+                seen_connecting = True
+            elif seen_connecting:
+                return DROPPED  # association started and then dropped, e.g. a rejected key
+            return None
+
+        outcome = self._wait_until(associated, CONNECT_TIMEOUT, cancel_event)
+        if outcome is False:
+            return CANCELLED if _cancelled(cancel_event) else TIMED_OUT
+        return outcome
+
+    def _record_connect(self, ssid, kind, outcome, start):
+        self.connect_attempts.inc(kind=kind, outcome=outcome)
+        if outcome == CONNECTED:
+            self.connect_latency.observe(self.clock.monotonic() - start)
+        elif outcome != CANCELLED:
+            logger.warning(f"❌ Could not connect to '{ssid}': {outcome}")
+
+    def _hand_off(self, adapter):
+        """Makes adapter the active one and drops the link on the previously active adapter."""
+        previous = self.active_adapter
+        self._active = self.adapters.index(adapter)
+        previous.backend.disconnect()
+        previous.status_monitor.invalidate()
+        self.handoffs.inc()
+        logger.info(f"🔀 Handed off from {previous.name} to {adapter.name}")
+
+    def _connect(self, ssid, kind, attempt, cancel_event):
+        """
+        Runs attempt(adapter), which returns a connect outcome. While the active adapter is
+        connected and a standby exists, the attempt runs on the standby and the active link
+        is only dropped once it succeeds; otherwise it runs on the active adapter.
+        Already being connected to ssid counts as success without touching either adapter.
+        """
+        with self._connect_lock:
+            if self.backend.status() == STATUS_CONNECTED and self.backend.current_connection()[0] == ssid:
+                logger.info(f"✅ Already connected to {ssid}.")
+                return True
+            start = self.clock.monotonic()
+            standby = self.standby_adapter()
+            if standby is None or self.backend.status() != STATUS_CONNECTED:
+                adapter, standby = self.active_adapter, None
+            else:
+                adapter = standby
+            outcome = CANCELLED
+            if not _cancelled(cancel_event):
+                self._disconnect_if_needed(adapter)
+                outcome = attempt(adapter)
+                if outcome != CONNECTED and _cancelled(cancel_event):
+                    outcome = CANCELLED
+            if standby is not None:
+                if outcome == CONNECTED:
+                    self._hand_off(standby)
+                else:
+                    standby.backend.disconnect()  # leave the standby idle; the active link was never touched
+        adapter.status_monitor.invalidate()
+        self._record_connect(ssid, kind, outcome, start)
+        return outcome == CONNECTED
+
+    def connect_to_network(self, ssid, password, cancel_event=None, bssid=None):
+        """Connects to a standard WPA2-Personal network, reusing its OS profile when one is installed."""
+
+        def attempt(adapter):
+            outcome = None
+            if adapter.profiles.has_profile(ssid, password):
+                if adapter.backend.activate_profile(ssid, bssid):
+                    outcome = self._wait_for_association(adapter, cancel_event)
+                else:
+                    outcome = REJECTED
+                if outcome != CONNECTED and not _cancelled(cancel_event):
+                    adapter.profiles.forget(ssid)  # stale profile; reinstall it below
+            if outcome != CONNECTED and not _cancelled(cancel_event):
+                if adapter.backend.connect(ssid, password, bssid):
+                    adapter.profiles.mark_installed(ssid, password)
+                    outcome = self._wait_for_association(adapter, cancel_event)
+                else:
+                    outcome = REJECTED
+            return outcome
+
+        return self._connect(ssid, 'personal', attempt, cancel_event)
+
+    def connect_to_enterprise_network(self, ssid, username, password, cancel_event=None, bssid=None):
+        """Connects to an enterprise network using a pre-existing OS profile."""
+
+        def attempt(adapter):
+            if not adapter.backend.connect_enterprise(ssid, username, password, bssid):
+                return REJECTED
+            if self._wait_until(lambda: True if adapter.status_monitor.refresh().ssid == ssid else None,
+                                CONNECT_TIMEOUT * 2, cancel_event):
+                return CONNECTED
+            return TIMED_OUT
+
+        return self._connect(ssid, 'enterprise', attempt, cancel_event)